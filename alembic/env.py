@@ -22,15 +22,19 @@ if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
 
-# DATABASE CONNECTION VARIABLES
-DB_USER=env_config("DB_USER")    
-DB_PASS=env_config("DB_PASS")
-DB_NAME=env_config("DB_NAME")
-DB_HOST=env_config("DB_HOST")
-DB_PORT=env_config("DB_PORT", cast=int)
-
-# DATABASE CONNECTION URL 
-DATABASE_URL = f"mysql+aiomysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# DATABASE_URL override (app/db/config.py jaisa) -- e.g. replica / dusra local DB migrate karne ke liye
+DATABASE_URL = env_config("DATABASE_URL", default="")
+
+if not DATABASE_URL:
+    # DATABASE CONNECTION VARIABLES
+    DB_USER=env_config("DB_USER")    
+    DB_PASS=env_config("DB_PASS")
+    DB_NAME=env_config("DB_NAME")
+    DB_HOST=env_config("DB_HOST")
+    DB_PORT=env_config("DB_PORT", cast=int)
+
+    # DATABASE CONNECTION URL 
+    DATABASE_URL = f"mysql+aiomysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
 config.set_main_option("sqlalchemy.url", DATABASE_URL)
 
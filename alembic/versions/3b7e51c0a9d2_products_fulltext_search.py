@@ -0,0 +1,30 @@
+"""products fulltext search
+
+Revision ID: 3b7e51c0a9d2
+Revises: ffc9a74c9d1d
+Create Date: 2026-10-18 10:05:12.418230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e51c0a9d2'
+down_revision: Union[str, Sequence[str], None] = 'ffc9a74c9d1d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ft_products_title', 'products', ['title'], unique=False, mysql_prefix='FULLTEXT')
+    op.create_index('ft_products_description', 'products', ['description'], unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ft_products_description', table_name='products')
+    op.drop_index('ft_products_title', table_name='products')
@@ -0,0 +1,38 @@
+"""sort composite indexes
+
+Revision ID: 5c9e0b7d2f41
+Revises: 8d2f4a6c1e93
+Create Date: 2026-10-18 16:42:08.531904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c9e0b7d2f41'
+down_revision: Union[str, Sequence[str], None] = '8d2f4a6c1e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset cursor price ko exact compare karta hai -- single precision FLOAT par 19.99 = stored value kabhi sach nahi
+    op.alter_column('products', 'price', existing_type=sa.Float(), type_=sa.Numeric(precision=10, scale=2), existing_nullable=False)
+    op.create_index('ix_products_price_id', 'products', ['price', 'id'], unique=False)
+    op.create_index('ix_products_created_at_id', 'products', ['created_at', 'id'], unique=False)
+    # MySQL FK ke liye bana implicit `category_id` index is ke baad khud drop ho jata hai
+    op.create_index('ix_product_category_category_id_product_id', 'product_category', ['category_id', 'product_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # FK (category_id) ko index chahiye -- composite drop karne se pehle wapas
+    op.create_index('category_id', 'product_category', ['category_id'], unique=False)
+    op.drop_index('ix_product_category_category_id_product_id', table_name='product_category')
+    op.drop_index('ix_products_created_at_id', table_name='products')
+    op.drop_index('ix_products_price_id', table_name='products')
+    op.alter_column('products', 'price', existing_type=sa.Numeric(precision=10, scale=2), type_=sa.Float(), existing_nullable=False)
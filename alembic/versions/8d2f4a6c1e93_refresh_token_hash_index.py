@@ -0,0 +1,38 @@
+"""refresh token hash index
+
+Revision ID: 8d2f4a6c1e93
+Revises: 3b7e51c0a9d2
+Create Date: 2026-10-18 11:42:37.905114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f4a6c1e93'
+down_revision: Union[str, Sequence[str], None] = '3b7e51c0a9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('refresh_tokens', sa.Column('token_hash', sa.String(length=64), nullable=True))
+    # Purane raw tokens ka digest -- already logged in users logout nahi hote
+    op.execute("UPDATE refresh_tokens SET token_hash = SHA2(token, 256)")
+    op.alter_column('refresh_tokens', 'token_hash', existing_type=sa.String(length=64), nullable=False)
+    op.create_index(op.f('ix_refresh_tokens_token_hash'), 'refresh_tokens', ['token_hash'], unique=True)
+    op.drop_column('refresh_tokens', 'token')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('refresh_tokens', sa.Column('token', sa.String(length=255), nullable=True))
+    # Digest se raw token wapas nahi banta -- purane tokens revoke, users dobara login karenge
+    op.execute("UPDATE refresh_tokens SET token = token_hash, revoked = 1")
+    op.alter_column('refresh_tokens', 'token', existing_type=sa.String(length=255), nullable=False)
+    op.drop_index(op.f('ix_refresh_tokens_token_hash'), table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token_hash')
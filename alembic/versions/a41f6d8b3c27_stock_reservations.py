@@ -0,0 +1,49 @@
+"""stock reservations
+
+Revision ID: a41f6d8b3c27
+Revises: 5c9e0b7d2f41
+Create Date: 2026-10-18 18:20:44.172093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41f6d8b3c27'
+down_revision: Union[str, Sequence[str], None] = '5c9e0b7d2f41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stock_reservations',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=16), server_default='pending', nullable=False),
+    sa.Column('expires_at', sa.TIMESTAMP(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_stock_reservations_status_expires_at', 'stock_reservations', ['status', 'expires_at'], unique=False)
+    op.create_table('stock_reservation_items',
+    sa.Column('reservation_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['reservation_id'], ['stock_reservations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('reservation_id', 'product_id')
+    )
+    op.create_index(op.f('ix_stock_reservation_items_product_id'), 'stock_reservation_items', ['product_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_stock_reservation_items_product_id'), table_name='stock_reservation_items')
+    op.drop_table('stock_reservation_items')
+    op.drop_index('ix_stock_reservations_status_expires_at', table_name='stock_reservations')
+    op.drop_table('stock_reservations')
@@ -0,0 +1,34 @@
+"""products updated_at index
+
+Revision ID: c2e8f05a7d19
+Revises: a41f6d8b3c27
+Create Date: 2026-10-18 19:05:31.664218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e8f05a7d19'
+down_revision: Union[str, Sequence[str], None] = 'a41f6d8b3c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ETag version: second precision par aik second ke do writes same max(updated_at) dete the
+    op.alter_column('products', 'updated_at', existing_type=sa.TIMESTAMP(), type_=mysql.TIMESTAMP(fsp=6),
+                    server_default=sa.text('CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)'), existing_nullable=False)
+    op.create_index('ix_products_updated_at', 'products', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_updated_at', table_name='products')
+    op.alter_column('products', 'updated_at', existing_type=mysql.TIMESTAMP(fsp=6), type_=sa.TIMESTAMP(),
+                    server_default=sa.text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'), existing_nullable=False)
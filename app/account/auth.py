@@ -4,15 +4,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import MultipleResultsFound
 from fastapi import HTTPException, status
 from fastapi.responses import JSONResponse
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError 
+from sqlalchemy.exc import SQLAlchemyError 
 from passlib.context import CryptContext
-from sqlalchemy import select
+from sqlalchemy import select, update
+from concurrent.futures import ThreadPoolExecutor
 from decouple import config
-from uuid import uuid4
+import hashlib
+import secrets
+import asyncio
 
-from app.account.db_commits import database_commit, db_get_one
 from app.account.models import RefreshToken, User
 from app.account.log_config import logger
+from app.account.token_cache import token_cache
 
 
 
@@ -22,6 +25,8 @@ EMAIL_VERIFICATION_TOKEN_TIME_HOUR= config("EMAIL_VERIFICATION_TOKEN_TIME_HOUR",
 PASSWORD_RESET_TOKEN= config("PASSWORD_RESET_TOKEN", cast=int)
 JWT_SECRET_KEY = config("JWT_SECRET_KEY")
 JWT_ALGORITHM = config("JWT_ALGORITHM")
+PASSWORD_HASH_WORKERS = config("PASSWORD_HASH_WORKERS", default=4, cast=int)
+PASSWORD_HASH_QUEUE_LIMIT = config("PASSWORD_HASH_QUEUE_LIMIT", default=64, cast=int)
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -35,6 +40,34 @@ def hash_password(password: str):
 def verify_password(plain_password: str, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
+
+# BCRYPT OFF THE EVENT LOOP
+# bcrypt GIL chhor deta hai, is liye thread pool kaafi hai. Queue limit se zyada pending ho toh 503 -- login storm worker ko block nahi karega.
+hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+hash_pending = 0
+
+
+async def run_in_hash_pool(func, *args):
+    global hash_pending
+    if hash_pending >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT:
+        logger.warning("Password hashing queue full")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Server busy, please try again.")
+
+    hash_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(hash_executor, func, *args)
+    finally:
+        hash_pending -= 1
+
+
+async def hash_password_async(password: str):
+    return await run_in_hash_pool(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password):
+    return await run_in_hash_pool(verify_password, plain_password, hashed_password)
+
 async def get_single_result(session: AsyncSession, stmt):
     try:
         result = await session.scalars(stmt)
@@ -79,38 +112,55 @@ def create_access_token(data: dict, expire_delta: timedelta = None):
 
     return jwt.encode(to_encode, JWT_SECRET_KEY, JWT_ALGORITHM)
 
-async def create_tokens(session: AsyncSession, user: User):
+# Refresh token random hai (256 bit), is liye salt ki zaroorat nahi -- seedha sha256
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def add_tokens(session: AsyncSession, user: User) -> dict:
+    # Sirf session mein add, commit caller karega (rotation mein revoke ke saath aik hi transaction)
     access_token = create_access_token(data={"sub": str(user.id)})
-    refresh_token_str = str(uuid4())
+    refresh_token_str = secrets.token_urlsafe(32)
     expires_at = datetime.now(timezone.utc) + timedelta(days=JWT_ACCESS_TOKEN_TIME_DAY)
 
     refresh_token = RefreshToken(
         user_id = user.id,
-        token = refresh_token_str,
+        token_hash = hash_refresh_token(refresh_token_str),
         expires_at = expires_at,
 
     )
     session.add(refresh_token)
 
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token_str,
+        "token_type": "bearer"
+    }
+
+
+async def commit_tokens(session: AsyncSession):
     try: 
         await session.commit()
-        return {
-            "access_token": access_token,
-            "refresh_token": refresh_token_str,
-            "token_type": "bearer"
-        }
-    except IntegrityError as e:
+    except SQLAlchemyError as e:
         await session.rollback()
-        print(f"Database Integrity hit: {e}")
-        raise None
+        logger.error(f"Refresh token commit failed: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Could not create session.")
+
+
+async def create_tokens(session: AsyncSession, user: User):
+    tokens = add_tokens(session, user)
+    await commit_tokens(session)
+    return tokens
     
 def decode_token(token: str):
+    # Same cookie har request par aata hai -- verified payload cache se, signature dobara check nahi
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
     try:
-        # 1. Algorithms ko list mein rakha
-        # 2. Key aur token ko print karke verify karein
-        # JWT decode karte waqt logger use karna
-        logger.debug(f"Decoding JWT token: {token}")
-        return jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        # Algorithms ko list mein rakha. Token khud kabhi log nahi hota (credential hai)
+        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
     except ExpiredSignatureError as e:
         logger.warning(f"Token expired: {str(e)}")
         raise HTTPException(status_code=401, detail="Token has Expired.")
@@ -119,6 +169,10 @@ def decode_token(token: str):
         logger.error(f"JWT Decode Error Type: {type(e).__name__}")
         logger.error(f"JWT Decode Error Message: {str(e)}")
         raise HTTPException(status_code=401, detail=f"Invalid Token: {str(e)}")
+
+    # Sirf valid tokens cache hote hain, invalid par har dafa 401
+    token_cache.set(token, payload)
+    return payload
     
 
 # REFRESH TOKEN
@@ -126,11 +180,23 @@ def decode_token(token: str):
 
     
 async def verify_refresh_token(session: AsyncSession, token: str):
+    """Returns (db_token, user) ya None. Token aur user aik hi JOIN query mein, unique index se."""
+    stmt = (
+        select(RefreshToken, User)
+        .join(User, User.id == RefreshToken.user_id)
+        .where(RefreshToken.token_hash == hash_refresh_token(token))
+    )
+    try:
+        row = (await session.execute(stmt)).one_or_none()
+    except SQLAlchemyError:
+        logger.exception("Database fetch error")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Database error occured." )
 
-    stmt = select(RefreshToken).where(RefreshToken.token == token)
-    db_token = await get_single_result(session, stmt)
-    
-    if not db_token or db_token.revoked:
+    if row is None:
+        return None
+    db_token, user = row
+
+    if db_token.revoked:
         return None
     expires_at = db_token.expires_at
 
@@ -138,9 +204,31 @@ async def verify_refresh_token(session: AsyncSession, token: str):
         expires_at = expires_at.replace(tzinfo=timezone.utc)
 
     if expires_at > datetime.now(timezone.utc):
-        user_stmt = select(User).where(User.id == db_token.user_id)
-        return await get_single_result(session, user_stmt)
+        return db_token, user
     return None
+
+
+# ROTATION
+# Purana token revoke + naya token insert -- aik hi transaction. Conditional UPDATE: do concurrent /refresh
+# same token ke saath aayein toh sirf aik jeetega, dusre ko 401.
+async def rotate_refresh_token(session: AsyncSession, token: str):
+    verified = await verify_refresh_token(session, token)
+    if not verified:
+        return None
+    db_token, user = verified
+
+    result = await session.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == db_token.id, RefreshToken.revoked == False)
+        .values(revoked=True)
+    )
+    if result.rowcount != 1:
+        await session.rollback()
+        return None
+
+    tokens = add_tokens(session, user)
+    await commit_tokens(session)
+    return user, tokens
   
 # CREATE EMAIL VERIFICATION TOKEN
 def create_email_verification_token(user_id: int):
@@ -154,8 +242,6 @@ def verify_email_token_and_get_user_id(token: str, token_type: str):
     # DECODE THE TOKEN
     payload = decode_token(token)
 
-    print(payload)
-
     if not payload or payload.get("type") != token_type:
         return None
    
@@ -172,12 +258,14 @@ def password_reset_token(user_id: int):
     return jwt.encode(encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
 
 async def revoke_refresh_token(session: AsyncSession, token: str):
-    stmt = select(RefreshToken).where(RefreshToken.token==token)
-    db_token = await db_get_one(session, stmt)
-
-    if db_token:
-        db_token.revoked = True
-        await database_commit(session, db_token)
+    # Aik UPDATE, unique index par -- pehle SELECT ki zaroorat nahi
+    stmt = update(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(token)).values(revoked=True)
+    try:
+        await session.execute(stmt)
+        await session.commit()
+    except SQLAlchemyError:
+        await session.rollback()
+        logger.exception("Database Transaction Failed")
         
 
 
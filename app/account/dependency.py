@@ -8,6 +8,7 @@ from app.db.config import SessionDep
 from app.account.models import User
 from app.account.log_config import logger
 from app.account.db_commits import db_get_one
+from app.account.user_cache import user_cache
 
 def not_data(token):
     if not token:
@@ -64,8 +65,13 @@ async def is_authenticated(session: SessionDep, request: Request):
             detail="Malformed access token"
         )
 
-    user = await user_extract(session, user_id)
-    logger.info(f"Authenticated user {user.id}")
+    # Cache hit par koi DB round trip nahi
+    user = user_cache.get(int(user_id))
+    if user is None:
+        user = await user_extract(session, user_id)
+        user_cache.set(user)
+    # Har request par aati hai -- sampled (LOG_SAMPLE_RATES)
+    logger.info("Authenticated user", extra={"sample": "auth", "user_id": user.id})
     return user
 
 
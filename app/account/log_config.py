@@ -1,22 +1,135 @@
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime, timezone
+from decouple import config, Csv
 import logging
-
+import atexit
+import queue
+import copy
+import json
+
+
+# LOGGING CONFIG
+# LOG_LEVELS: per-logger levels, e.g. "account=DEBUG,sqlalchemy.engine=WARNING,uvicorn.access=WARNING"
+LOG_LEVEL = config("LOG_LEVEL", default="INFO")
+# Libraries (sqlalchemy pool, httpx, ...) ke liye -- INFO par bohat shor karti hain
+LOG_ROOT_LEVEL = config("LOG_ROOT_LEVEL", default="WARNING")
+LOG_LEVELS = config("LOG_LEVELS", default="", cast=Csv())
+LOG_FORMAT = config("LOG_FORMAT", default="json") # json | text
+# Sampling: high-volume lines logger.info(..., extra={"sample": "auth"}) se tag hoti hain. "auth=0.01" -> har 100 mein se 1
+LOG_SAMPLE_RATES = config("LOG_SAMPLE_RATES", default="auth=0.01", cast=Csv())
+LOG_SAMPLE_DEFAULT_RATE = config("LOG_SAMPLE_DEFAULT_RATE", default=1.0, cast=float)
+
+# LogRecord ke apne attributes -- in ke ilawa jo bhi ho wo extra={} se aaya hai
+RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "sample"}
+
+exception_formatter = logging.Formatter()
+
+
+def parse_pairs(items: list[str]) -> dict[str, str]:
+    pairs = {}
+    for item in items:
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip():
+            pairs[name.strip()] = value.strip()
+    return pairs
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "location": f"{record.filename}:{record.funcName}:{record.lineno}",
+        }
+        for key, value in vars(record).items():
+            if key not in RESERVED_ATTRS:
+                entry[key] = value
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class RecordQueueHandler(QueueHandler):
+    # Default prepare() traceback ko message mein mila deta hai; yahan alag rakhte hain taake JSON mein field bane
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """Tagged records mein se har N-th hi aage jata hai. Counter based -- random() ki zaroorat nahi, aur drop queue se pehle."""
+
+    def __init__(self, rates: dict[str, float], default_rate: float):
+        super().__init__()
+        self.rates = rates
+        self.default_rate = default_rate
+        self.counters: dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "sample", None)
+        if key is None:
+            return True
+
+        rate = self.rates.get(key, self.default_rate)
+        if rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+
+        count = self.counters.get(key, 0) + 1
+        self.counters[key] = count
+        if count % round(1 / rate):
+            return False
+        record.sample_rate = rate
+        return True
+
+
+# QUEUE + BACKGROUND LISTENER
+# Request path sirf queue mein record daalta hai (non-blocking); stderr par likhna listener thread karta hai
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+log_listener: QueueListener | None = None
 
 
 def setup_logger():
-    #create Handler
-
-    stream_handler = logging.StreamHandler() #logging.DEBUG
+    global log_listener
 
+    #create Handler
+    stream_handler = logging.StreamHandler()
 
-    # Formater 
-    formater = logging.Formatter(fmt="{asctime} - {name} - {levelname} - {filename}:{funcName}:{lineno} - {message}", style="{")
+    # Formater
+    if LOG_FORMAT == "json":
+        formater = JsonFormatter()
+    else:
+        formater = logging.Formatter(fmt="{asctime} - {name} - {levelname} - {filename}:{funcName}:{lineno} - {message}", style="{")
 
     # Set Formater
     stream_handler.setFormatter(formater)
 
+    queue_handler = RecordQueueHandler(log_queue)
+    sample_rates = {name: float(rate) for name, rate in parse_pairs(LOG_SAMPLE_RATES).items()}
+    queue_handler.addFilter(SamplingFilter(sample_rates, LOG_SAMPLE_DEFAULT_RATE))
+
+    if log_listener is None:
+        log_listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        log_listener.start()
+        # Exit par queue mein bache records flush
+        atexit.register(log_listener.stop)
+
+    # Root bhi queue par -- libraries (sqlalchemy, fastapi) ke records bhi isi pipeline se
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(LOG_ROOT_LEVEL)
+
     # Logger Name
     logger = logging.getLogger("account")
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(LOG_LEVEL)
 
     # Clear previous handlers
     logger.handlers.clear()
@@ -24,7 +137,11 @@ def setup_logger():
     # Prevent double logging
     logger.propagate = False
 
-    logger.addHandler(stream_handler)
+    logger.addHandler(queue_handler)
+
+    # Per-logger levels (account ko bhi override kar sakte hain)
+    for name, level in parse_pairs(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level.upper())
 
     return logger
 
@@ -33,5 +150,3 @@ logger = setup_logger()
 
 # Test
 #logger.debug("Logger initialized successfully")
-
-
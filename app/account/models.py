@@ -27,7 +27,8 @@ class RefreshToken(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"),nullable=False)
-    token: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Raw token sirf cookie mein; DB mein sha256 hex (fixed 64 chars) -- unique index se O(log n) lookup
+    token_hash: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
     expires_at: Mapped[datetime] = mapped_column(TIMESTAMP, nullable=False)
     revoked: Mapped[bool] = mapped_column(Boolean, server_default="0")
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP,server_default=text("CURRENT_TIMESTAMP"),nullable=False)
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.responses import JSONResponse
 
 from app.account.schemas import PasswordChangeRequest, PasswordResetNew, UserCreate, UserOut, UserLogin, UserLoggedIn, ForgetPasswordReset
-from app.account.auth import create_tokens, revoke_refresh_token, set_response,verify_refresh_token
+from app.account.auth import create_tokens, revoke_refresh_token, rotate_refresh_token, set_response
 from app.account.services import authenticate_user, change_password, create_user, email_verification_send, password_reset, verify_email_token, verify_password_token
 from app.account.dependency import not_refresh_token, require_admin
 from app.account.dependency import is_authenticated
@@ -36,20 +36,21 @@ async def profile(user: User = Depends(is_authenticated)):
     return user
     
 @router.get("/refresh", response_model=UserLoggedIn)
-async def refresh(session: SessionDep, request: Request):
+async def refresh(session: SessionDep, request: Request, response: Response):
     token = request.cookies.get("refresh_token")
 
     # Validate the token is their or missing
     not_refresh_token(token)
 
-    user = await verify_refresh_token(session, token)
+    # Purana token revoke + naya issue, aik transaction mein
+    rotated = await rotate_refresh_token(session, token)
 
-    if not user:
+    if not rotated:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired refresh token")
     
-    tokens = await create_tokens(session, user)
+    user, tokens = rotated
 
-    response = JSONResponse(content={"message": "Login Successful"})
+    # Injected response par cookies -- user return karne par bhi client tak pohanchti hain
     response.set_cookie(
         key="access_token",
         value=tokens["access_token"],
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
 import string
 
-from app.account.auth import hash_password
+from app.account.auth import hash_password_async
 
 
 
@@ -16,14 +16,14 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     password: str = Field(min_length=3)
 
-    # It hashes the password and renames the key
-    def to_db_dict(self):
+    # It hashes the password (bcrypt pool mein) and renames the key
+    async def to_db_dict(self):
         user_data = self.model_dump()
 
         password_plain = user_data.pop("password", None)
 
         if password_plain:
-            user_data['hashing_password'] = hash_password(password_plain)
+            user_data['hashing_password'] = await hash_password_async(password_plain)
         return user_data
     
 class UserOut(BaseModel):
@@ -4,7 +4,7 @@ from fastapi import HTTPException, status
 from sqlalchemy import select
 import logging
 
-from app.account.auth import create_email_verification_token, hash_password, password_reset_token, verify_email_token_and_get_user_id, verify_password
+from app.account.auth import create_email_verification_token, hash_password_async, password_reset_token, verify_email_token_and_get_user_id, verify_password_async
 from app.account.schemas import ForgetPasswordReset, PasswordChangeRequest, PasswordResetNew, UserCreate, UserLogin, UserOut
 from app.account.models import User
 from app.account.db_commits import database_commit, db_get_one
@@ -26,7 +26,7 @@ async def create_user(session: AsyncSession, user_in: UserCreate) -> UserOut:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
     
     # 3. Agar nahi mila (which is good for registration), toh naya user banayein
-    user_data = user_in.to_db_dict()
+    user_data = await user_in.to_db_dict()
     new_user = User(**user_data)
     
     session.add(new_user)
@@ -40,7 +40,7 @@ async def authenticate_user(session: AsyncSession, user_login: UserLogin):
 
     existing_user =  await db_get_one(session, stmt)
 
-    if not existing_user or not verify_password(user_login.password, existing_user.hashing_password):
+    if not existing_user or not await verify_password_async(user_login.password, existing_user.hashing_password):
         return None
     
     if not existing_user.is_active:
@@ -64,7 +64,8 @@ async def email_verification_send(session: AsyncSession, user: User):
 
     token = create_email_verification_token(user.id)
     link = f"http://localhost:8000/account/verify?token={token}"
-    print(f"Verify your email: {link}")
+    # Email sending abhi wired nahi -- link sirf debug level par (token hai, production logs mein nahi jana chahiye)
+    logger.debug(f"Verify your email: {link}")
     return {"message": "Verification email sent"}
 
 
@@ -91,15 +92,15 @@ async def verify_email_token(session: AsyncSession, token: str):
 # CHANGE PASSWORD
 async def change_password(session: AsyncSession, user: User, data: PasswordChangeRequest):
 
-    if not verify_password(data.old_password, user.hashing_password):
+    if not await verify_password_async(data.old_password, user.hashing_password):
         logger.warning("Incorrect password", extra={"user_id": user.id})
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Password isn't correct.")
 
-    if verify_password(data.new_password, user.hashing_password):
+    if await verify_password_async(data.new_password, user.hashing_password):
         logger.warning("Same password as old.", extra={"user_id": user.id})
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="New password must be different.")
 
-    user.hashing_password = hash_password(data.new_password)
+    user.hashing_password = await hash_password_async(data.new_password)
 
     session.add(user)
 
@@ -121,7 +122,7 @@ async def password_reset(session: AsyncSession, data: ForgetPasswordReset):
     
     token = password_reset_token(user.id)
     link = f"http://localhost:8000/account/verify?Password_Reset={token}"
-    print(f'Reset Your Password: {link}')
+    logger.debug(f"Reset Your Password: {link}")
     return {"msg": "Link for reset password has been sent."}
 
 # VERIFY PASSWORD RESET TOKEN
@@ -139,7 +140,7 @@ async def verify_password_token(session: AsyncSession, data: PasswordResetNew):
         logger.warning("User not Found.")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not Found.")
     
-    user.hashing_password = hash_password(data.new_password)
+    user.hashing_password = await hash_password_async(data.new_password)
 
     session.add(user)
     await database_commit(session, user)
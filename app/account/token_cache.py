@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from threading import Lock
+from decouple import config
+import hashlib
+import time
+
+
+TOKEN_CACHE_MAX_ENTRIES = config("TOKEN_CACHE_MAX_ENTRIES", default=10000, cast=int)
+TOKEN_CACHE_MAX_TTL_SEC = config("TOKEN_CACHE_MAX_TTL_SEC", default=300, cast=float)
+
+
+class TokenPayloadCache:
+    """sha256(token) -> verified payload. Entry token ke exp se pehle hi expire ho jati hai."""
+
+    def __init__(self, max_entries: int, max_ttl: float):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        # Poora token memory mein key nahi banate, sirf digest
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict | None:
+        key = self.digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[0])
+
+    def set(self, token: str, payload: dict):
+        expires_at = time.time() + self.max_ttl
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+
+        key = self.digest(token)
+        with self._lock:
+            self._entries[key] = (dict(payload), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+token_cache = TokenPayloadCache(TOKEN_CACHE_MAX_ENTRIES, TOKEN_CACHE_MAX_TTL_SEC)
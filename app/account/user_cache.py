@@ -0,0 +1,81 @@
+from collections import OrderedDict
+from threading import Lock
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+from decouple import config
+import time
+
+from app.account.models import User
+
+
+USER_CACHE_TTL_SEC = config("USER_CACHE_TTL_SEC", default=10, cast=float)
+USER_CACHE_MAX_ENTRIES = config("USER_CACHE_MAX_ENTRIES", default=10000, cast=int)
+
+USER_COLUMNS = [column.key for column in User.__table__.columns]
+
+
+class UserCache:
+    """user_id -> column snapshot. ORM object share nahi hota, har request ko apna detached User milta hai."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id: int) -> User | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] <= time.monotonic():
+                self._entries.pop(user_id, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            snapshot = entry[0]
+
+        # Detached instance: session.add(user) karne par UPDATE hota hai, INSERT nahi
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return user
+
+    def set(self, user: User):
+        snapshot = {key: getattr(user, key) for key in USER_COLUMNS}
+        with self._lock:
+            self._entries[user.id] = (snapshot, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+user_cache = UserCache(USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SEC)
+
+
+# INVALIDATION
+# Password change, email verify, deactivate, is_admin -- koi bhi User UPDATE/DELETE flush ho toh entry hatao,
+# aur commit ke baad dobara hatao taake flush aur commit ke beech padhi gayi purani row cache mein na rahe.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_user_on_write(mapper, connection, target: User):
+    user_cache.invalidate(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("dirty_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_users_after_commit(session: Session):
+    for user_id in session.info.pop("dirty_user_ids", ()):
+        user_cache.invalidate(user_id)
@@ -1,30 +1,70 @@
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from fastapi import Depends
+from fastapi import Depends, Request
 from typing import AsyncGenerator, Annotated
 from decouple import config
+import logging
 
+from app.db.metrics import InstrumentedAsyncPool
 
 
-# DATABASE CONNECTION VARIABLES
-DB_USER=config("DB_USER")    
-DB_PASS=config("DB_PASS")
-DB_NAME=config("DB_NAME")
-DB_HOST=config("DB_HOST")
-DB_PORT=config("DB_PORT", cast=int)
 
-# DATABASE CONNECTION URL 
-DATABASE_URL = f"mysql+aiomysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# DATABASE_URL seedha de sakte hain (e.g. local SQLite / dusra MySQL), warna DB_* variables se banta hai
+DATABASE_URL = config("DATABASE_URL", default="")
 
+if not DATABASE_URL:
+    # DATABASE CONNECTION VARIABLES
+    DB_USER=config("DB_USER")    
+    DB_PASS=config("DB_PASS")
+    DB_NAME=config("DB_NAME")
+    DB_HOST=config("DB_HOST")
+    DB_PORT=config("DB_PORT", cast=int)
 
-engine = create_async_engine(DATABASE_URL, echo=True, future=True)
+    # DATABASE CONNECTION URL 
+    DATABASE_URL = f"mysql+aiomysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+# ENGINE PROFILE
+# development: har SQL statement log (echo). production: echo off, pool settings neeche wali env se
+DB_PROFILE = config("DB_PROFILE", default="development")
+DB_ECHO = config("DB_ECHO", default=DB_PROFILE == "development", cast=bool)
+DB_POOL_SIZE = config("DB_POOL_SIZE", default=5, cast=int)
+DB_MAX_OVERFLOW = config("DB_MAX_OVERFLOW", default=10, cast=int)
+DB_POOL_TIMEOUT = config("DB_POOL_TIMEOUT", default=30, cast=float)
+DB_POOL_RECYCLE = config("DB_POOL_RECYCLE", default=1800, cast=int) # MySQL wait_timeout se kam rakhein
+DB_POOL_PRE_PING = config("DB_POOL_PRE_PING", default=DB_PROFILE == "production", cast=bool)
+DB_CONNECT_TIMEOUT = config("DB_CONNECT_TIMEOUT", default=10, cast=int)
+
+
+def make_engine(url: str, pool_pre_ping: bool = DB_POOL_PRE_PING):
+    # connect_timeout sirf MySQL drivers samajhte hain
+    connect_args = {"connect_timeout": DB_CONNECT_TIMEOUT} if url.startswith("mysql") else {}
+    return create_async_engine(
+        url,
+        future=True,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=pool_pre_ping,
+        connect_args=connect_args,
+    )
+
+
+# echo=True apna synchronous StreamHandler lagata hai -- is ke bajaye logger level, records app ki queue pipeline se jate hain
+if DB_ECHO:
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+
+
+engine = make_engine(DATABASE_URL)
 
 async_session = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
 
 
-async def get_session()->AsyncGenerator[AsyncSession, None]:
+async def get_session(request: Request)->AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
+        # Commit hone par read-your-writes stickiness mark karne ke liye (app/db/routing.py)
+        session.info["request_scope"] = request.scope
         yield session
 
 SessionDep = Annotated[AsyncSession, Depends(get_session)]
 
-
@@ -0,0 +1,73 @@
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from threading import Lock
+import time
+
+
+class PoolMetrics:
+    """Connection checkout ka wait time aur timeouts -- pool size ko worker count ke against tune karne ke liye."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_avg": self.wait_seconds_total / self.checkouts if self.checkouts else 0.0,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    # Har pool (primary, har replica) ke apne counters -- engine label ke saath alag report hote hain
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        # engine.dispose() naya pool banata hai -- counters wahi rahen (Prometheus counters reset na hon)
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    # _do_get hi wo jagah hai jahan pool full hone par request wait karti hai
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+def pool_status(engine) -> dict:
+    pool = engine.pool
+    status = {"class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "timeout": pool.timeout(),
+        })
+    if isinstance(pool, InstrumentedAsyncPool):
+        status.update(pool.metrics.snapshot())
+    return status
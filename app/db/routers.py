@@ -0,0 +1,38 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import text
+import asyncio
+
+from app.account.log_config import logger
+from app.db.config import DB_POOL_TIMEOUT, engine
+from app.db.metrics import pool_status
+from app.db.routing import replica_status, replicas
+from app.metrics import CONTENT_TYPE, render_metrics
+
+
+router = APIRouter(tags=["Health"])
+
+
+# HEALTH + POOL METRICS
+@router.get("/health")
+async def health():
+    try:
+        async with asyncio.timeout(DB_POOL_TIMEOUT):
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        database = "ok"
+    except Exception as e:
+        logger.error(f"Health check failed: {type(e).__name__}: {e}")
+        database = "unavailable"
+
+    content = {"status": "ok" if database == "ok" else "degraded", "database": database, "pool": pool_status(engine), "replicas": replica_status()}
+    status_code = status.HTTP_200_OK if database == "ok" else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(content=content, status_code=status_code)
+
+
+# PROMETHEUS SCRAPE ENDPOINT
+# /health ki tarah open -- ingress par internal network tak limit karein
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    engines = {"primary": engine, **{replica.name: replica.engine for replica in replicas}}
+    return PlainTextResponse(render_metrics(engines), media_type=CONTENT_TYPE)
@@ -0,0 +1,215 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from contextvars import ContextVar
+from threading import Lock
+from decouple import config
+import bisect
+import time
+
+from app.db.metrics import pool_status
+
+
+# PROMETHEUS-STYLE METRICS
+# prometheus_client ki dependency ke baghair -- sirf counters/gauges/histograms jo humein chahiye, text format mein
+METRICS_ENABLED = config("METRICS_ENABLED", default=True, cast=bool)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple, float] = {}
+        self._lock = Lock()
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{format_labels(self.labels, labels)} {format_value(value)}" for labels, value in values]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: tuple = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # labels -> [per-bucket counts (last = +Inf), sum, count]; cumulative sirf render par
+        self._values: dict[tuple, list] = {}
+        self._lock = Lock()
+
+    def observe(self, value: float, labels: tuple = ()):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = [(labels, list(counts), total, count) for labels, (counts, total, count) in self._values.items()]
+
+        lines = []
+        for labels, counts, total, count in values:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{format_labels(self.labels, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.labels, labels)} {format_value(total)}")
+            lines.append(f"{self.name}_count{format_labels(self.labels, labels)} {count}")
+        return lines
+
+
+http_requests_total = Counter("http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+http_request_duration = Histogram("http_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+http_requests_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+http_request_db_queries = Histogram("http_request_db_queries", "SQL statements executed per request.", ("method", "route"), QUERY_COUNT_BUCKETS)
+http_request_db_seconds = Histogram("http_request_db_seconds", "Time spent in SQL per request.", ("method", "route"))
+db_query_duration = Histogram("db_query_duration_seconds", "SQL statement latency.")
+
+METRICS = [http_requests_total, http_request_duration, http_requests_in_flight, http_request_db_queries, http_request_db_seconds, db_query_duration]
+
+
+# PER-REQUEST SQL ACCOUNTING
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+# Engine class par listen -- primary aur replica sab engines cover
+@event.listens_for(Engine, "before_cursor_execute")
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def record_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    db_query_duration.observe(elapsed)
+    stats = request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+
+@event.listens_for(Engine, "handle_error")
+def discard_query_timer(context):
+    # Fail hone par after_cursor_execute nahi chalta -- start time stack se hatao
+    if context.connection is not None:
+        timers = context.connection.info.get("query_start_time")
+        if timers:
+            timers.pop()
+
+
+# HTTP MIDDLEWARE
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            return await self.app(scope, receive, send)
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        http_requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_flight.dec()
+            request_stats.reset(token)
+
+            # Route template (/api/products/{slug}) label -- raw path se cardinality phat jati hai
+            route = scope.get("route")
+            labels = (scope["method"], route.path if route is not None else "unmatched")
+            http_request_duration.observe(elapsed, labels)
+            http_requests_total.inc((*labels, str(status_code)))
+            http_request_db_queries.observe(stats.queries, labels)
+            http_request_db_seconds.observe(stats.db_seconds, labels)
+
+
+# TEXT EXPOSITION
+def render_pool_metrics(engines: dict) -> list[str]:
+    statuses = {name: pool_status(engine) for name, engine in engines.items()}
+    lines = []
+    for field, metric, kind, help_text in (
+        ("checkouts", "db_pool_checkouts_total", "counter", "Connection checkouts from the pool."),
+        ("checkout_timeouts", "db_pool_checkout_timeouts_total", "counter", "Checkouts that hit pool_timeout."),
+        ("wait_seconds_total", "db_pool_wait_seconds_total", "counter", "Time spent waiting for a pooled connection."),
+        ("wait_seconds_max", "db_pool_wait_seconds_max", "gauge", "Longest single wait for a pooled connection."),
+        ("size", "db_pool_size", "gauge", "Pool size per engine."),
+        ("checked_out", "db_pool_checked_out", "gauge", "Pool checked out per engine."),
+        ("overflow", "db_pool_overflow", "gauge", "Pool overflow per engine."),
+    ):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for name, status in statuses.items():
+            value = status.get(field)
+            if value is not None:
+                lines.append(f"{metric}{format_labels(('engine',), (name,))} {format_value(value)}")
+    return lines
+
+
+def render_metrics(engines: dict) -> str:
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    lines.extend(render_pool_metrics(engines))
+    return "\n".join(lines) + "\n"
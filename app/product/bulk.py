@@ -0,0 +1,277 @@
+from collections.abc import AsyncIterator
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import insert, select
+from collections import defaultdict
+from pydantic import ValidationError
+from decouple import config
+from uuid import uuid4
+import codecs
+import json
+import csv
+import io
+
+from app.account.log_config import logger
+from app.db.config import async_session
+from app.product.cache import invalidate_catalog
+from app.product.models import Category, Product, product_category_table
+from app.product.schemas import ProductCreate
+from app.product.suggest import suggest_index
+from app.product.utils import generate_slug
+
+
+BULK_IMPORT_BATCH_SIZE = config("BULK_IMPORT_BATCH_SIZE", default=1000, cast=int)
+BULK_IMPORT_MAX_ERRORS = config("BULK_IMPORT_MAX_ERRORS", default=1000, cast=int)
+EXPORT_BATCH_SIZE = config("EXPORT_BATCH_SIZE", default=1000, cast=int)
+
+EXPORT_COLUMNS = ["id", "title", "description", "slug", "price", "stock_quantity", "image_url", "created_at", "updated_at", "categories"]
+
+# "categories" column/field: "phones|laptops|3" ya JSON list
+CATEGORY_SEPARATOR = "|"
+
+
+##############################################
+################ STREAM PARSING ##############
+##############################################
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def iter_ndjson_rows(lines: AsyncIterator[str]) -> AsyncIterator[tuple[int, dict | None, str | None]]:
+    row_number = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield row_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield row_number, None, "Row must be a JSON object"
+            continue
+        yield row_number, row, None
+
+
+async def iter_csv_rows(lines: AsyncIterator[str]) -> AsyncIterator[tuple[int, dict | None, str | None]]:
+    header = None
+    record = ""
+    row_number = 0
+    async for line in lines:
+        # Quoted field ke andar newline ho toh record tab tak jorte raho jab tak quotes balance na hon
+        record = f"{record}\n{line}" if record else line
+        if record.count('"') % 2:
+            continue
+        values, record = next(csv.reader([record])), ""
+
+        if header is None:
+            header = [value.strip() for value in values]
+            continue
+        if not any(value.strip() for value in values):
+            continue
+
+        row_number += 1
+        if len(values) != len(header):
+            yield row_number, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+
+        yield row_number, dict(zip(header, values)), None
+
+
+##############################################
+################ BULK IMPORT #################
+##############################################
+
+def as_list(value) -> list:
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        return value.split(CATEGORY_SEPARATOR)
+    return value if isinstance(value, list) else [value]
+
+
+def resolve_categories(row: dict, category_map: dict) -> tuple[list[int], list[str]]:
+    ids, errors = [], []
+    for ref in [*as_list(row.pop("categories", None)), *as_list(row.pop("category_ids", None))]:
+        key = ref if isinstance(ref, int) else str(ref).strip()
+        if isinstance(key, str) and key.isdigit():
+            key = int(key)
+        if isinstance(key, str):
+            key = key.lower()
+        if key not in category_map:
+            errors.append(f"Unknown category: {ref}")
+            continue
+        ids.append(category_map[key])
+    return list(dict.fromkeys(ids)), errors
+
+
+async def load_category_map(session: AsyncSession) -> dict:
+    # Aik hi SELECT: name (lowercase) aur id dono se lookup
+    result = await session.execute(select(Category.id, Category.name))
+    category_map = {}
+    for category_id, name in result:
+        category_map[category_id] = category_id
+        category_map[name.lower()] = category_id
+    return category_map
+
+
+async def assign_slugs(session: AsyncSession, products: list[dict]):
+    # Pichle batches commit ho chuke hain, is liye aik SELECT se DB + is batch dono ke collisions pakre jaate hain
+    base_slugs = [generate_slug(product["title"]) for product in products]
+    result = await session.scalars(select(Product.slug).where(Product.slug.in_(set(base_slugs))))
+    taken = set(result.all())
+
+    for product, slug in zip(products, base_slugs):
+        if not slug or slug in taken:
+            slug = f"{slug}-{uuid4().hex[:8]}" if slug else uuid4().hex
+        taken.add(slug)
+        product["slug"] = slug
+
+
+async def insert_batch(session: AsyncSession, batch: list[tuple[int, dict, list[int]]]) -> list[tuple[int, str]]:
+    products = [product for _, product, _ in batch]
+    try:
+        await assign_slugs(session, products)
+        await session.execute(insert(Product), products)
+
+        # MySQL RETURNING support nahi karta -- ids slug se wapas lo (slug unique hai)
+        result = await session.execute(select(Product.id, Product.slug).where(Product.slug.in_([p["slug"] for p in products])))
+        ids = {slug: product_id for product_id, slug in result}
+
+        links = [
+            {"product_id": ids[product["slug"]], "category_id": category_id}
+            for _, product, category_ids in batch
+            for category_id in category_ids
+        ]
+        if links:
+            await session.execute(insert(product_category_table), links)
+
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error(f"Bulk import batch failed: {e}")
+        return [(row_number, "Database error, batch rolled back") for row_number, _, _ in batch]
+
+    invalidate_catalog()
+    suggest_index.add_products([(ids[product["slug"]], product["title"], product["slug"]) for product in products])
+    return []
+
+
+async def bulk_import_products(session: AsyncSession, rows: AsyncIterator[tuple[int, dict | None, str | None]]) -> dict:
+    category_map = await load_category_map(session)
+
+    processed = created = failed = 0
+    errors = []
+    batch = []
+
+    def record_error(row_number: int, messages: list[str]):
+        nonlocal failed
+        failed += 1
+        if len(errors) < BULK_IMPORT_MAX_ERRORS:
+            errors.append({"row": row_number, "errors": messages})
+
+    async def flush():
+        nonlocal created
+        batch_errors = await insert_batch(session, batch)
+        for row_number, message in batch_errors:
+            record_error(row_number, [message])
+        created += len(batch) - len(batch_errors)
+        batch.clear()
+
+    async for row_number, row, parse_error in rows:
+        processed += 1
+        if parse_error:
+            record_error(row_number, [parse_error])
+            continue
+
+        category_ids, category_errors = resolve_categories(row, category_map)
+        try:
+            product = ProductCreate(**row, category_ids=category_ids)
+        except ValidationError as e:
+            messages = [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()]
+            record_error(row_number, category_errors + messages)
+            continue
+        if category_errors:
+            record_error(row_number, category_errors)
+            continue
+
+        product_dict = product.model_dump(exclude={"category_ids"})
+        # ProductOut.description required str hai -- NULL likha toh har page jis mein ye row aaye 500 deta
+        product_dict["description"] = product_dict["description"] or ""
+        product_dict["image_url"] = str(row.get("image_url") or "")
+        batch.append((row_number, product_dict, category_ids))
+
+        if len(batch) >= BULK_IMPORT_BATCH_SIZE:
+            await flush()
+
+    if batch:
+        await flush()
+
+    return {
+        "processed": processed,
+        "created": created,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+    }
+
+
+##############################################
+################ EXPORT ######################
+##############################################
+
+async def load_category_names(session: AsyncSession, product_ids: list[int]) -> dict[int, list[str]]:
+    stmt = (
+        select(product_category_table.c.product_id, Category.name)
+        .join(Category, Category.id == product_category_table.c.category_id)
+        .where(product_category_table.c.product_id.in_(product_ids))
+    )
+    names = defaultdict(list)
+    for product_id, name in await session.execute(stmt):
+        names[product_id].append(name)
+    return names
+
+
+def export_row(row, categories: list[str]) -> dict:
+    product = row._asdict()
+    product["created_at"] = product["created_at"].isoformat() if product["created_at"] else None
+    product["updated_at"] = product["updated_at"].isoformat() if product["updated_at"] else None
+    product["categories"] = categories
+    return product
+
+
+async def export_products(format: str) -> AsyncIterator[str]:
+    if format == "csv":
+        yield ",".join(EXPORT_COLUMNS) + "\n"
+
+    columns = [getattr(Product, name) for name in EXPORT_COLUMNS if name != "categories"]
+    stmt = select(*columns).order_by(Product.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+    # Server-side cursor aik connection par khula rehta hai, jab tak wo consume na ho us par dusri query nahi chal sakti --
+    # is liye categories dusre session se, har batch ke liye aik query
+    async with async_session() as stream_session, async_session() as lookup_session:
+        result = await stream_session.stream(stmt)
+        async for rows in result.partitions():
+            categories = await load_category_names(lookup_session, [row.id for row in rows])
+            products = [export_row(row, categories.get(row.id, [])) for row in rows]
+
+            if format == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer, lineterminator="\n")
+                for product in products:
+                    product["categories"] = CATEGORY_SEPARATOR.join(product["categories"])
+                    writer.writerow(product[name] for name in EXPORT_COLUMNS)
+                yield buffer.getvalue()
+            else:
+                yield "".join(json.dumps(product) + "\n" for product in products)
@@ -0,0 +1,118 @@
+from collections import OrderedDict
+from threading import Lock
+from decouple import config
+import time
+
+from app.db.routing import read_source
+
+
+# Generation per process hai: `uvicorn --workers N` mein write sirf usi worker ka cache saaf karta hai, baaqi workers
+# purani entries TTL tak serve kar sakte hain. Multi-worker deployment mein staleness ki had yahi TTL hai -- utna hi rakhein
+# jitna purana catalog chal sakta hai (0 = cache band). Aik worker mein write ke baad purani entry kabhi serve nahi hoti.
+CATALOG_CACHE_TTL_SEC = config("CATALOG_CACHE_TTL_SEC", default=30, cast=float)
+CATALOG_CACHE_MAX_ENTRIES = config("CATALOG_CACHE_MAX_ENTRIES", default=1024, cast=int)
+# count=cached totals: multi-worker mein bhi isi TTL tak purane
+COUNT_CACHE_TTL_SEC = config("COUNT_CACHE_TTL_SEC", default=60, cast=float)
+
+MISSING = object()
+
+
+class CatalogCache:
+    """TTL + LRU cache. Har write generation bump karta hai, purani generation ki entries is process mein kabhi serve nahi
+    hotin. Dusre worker processes ke liye sirf TTL bound hai (CATALOG_CACHE_TTL_SEC dekhein)."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+
+            value, generation, expires_at = entry
+            if generation != self.generation or expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return MISSING
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, generation: int):
+        with self._lock:
+            # Read ke dauraan write ho gaya toh result pehle se stale hai -- store hi mat karo
+            if generation != self.generation:
+                return
+            self._entries[key] = (value, generation, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def bump(self):
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_sec": self.ttl,
+                "generation": self.generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+catalog_cache = CatalogCache(CATALOG_CACHE_MAX_ENTRIES, CATALOG_CACHE_TTL_SEC)
+# Totals filter par depend karte hain, page par nahi -- alag cache, lambi TTL
+count_cache = CatalogCache(CATALOG_CACHE_MAX_ENTRIES, COUNT_CACHE_TTL_SEC)
+
+
+# Har catalog write ke baad
+def invalidate_catalog():
+    catalog_cache.bump()
+    count_cache.bump()
+
+
+def cache_key(name: str, **params) -> tuple:
+    # Normalize: list params sorted/dedup, strings strip -- ?a=x&a=y aur ?a=y&a=x same entry
+    normalized = []
+    for param, value in sorted(params.items()):
+        if isinstance(value, (list, tuple, set)):
+            value = tuple(sorted(set(value)))
+        elif isinstance(value, str):
+            value = value.strip()
+        normalized.append((param, value))
+    return (name, tuple(normalized))
+
+
+async def cached(key: tuple, loader, cache: CatalogCache = catalog_cache):
+    # Replica aur primary reads alag entries: sticky/primary read kabhi replica ka (stale) result nahi paata
+    key = (read_source.get(), key)
+    generation = cache.generation
+    value = cache.get(key)
+    if value is not MISSING:
+        return value
+
+    value = await loader()
+    cache.set(key, value, generation)
+    return value
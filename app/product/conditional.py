@@ -0,0 +1,68 @@
+from fastapi import Request, Response, status
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import NamedTuple
+from decouple import config
+import hashlib
+
+
+# Har request par revalidate (If-None-Match) -- body tabhi aati hai jab badli ho
+CATALOG_CACHE_CONTROL = config("CATALOG_CACHE_CONTROL", default="public, no-cache")
+
+
+class Validators(NamedTuple):
+    etag: str
+    last_modified: datetime | None = None
+
+
+def make_etag(*parts) -> str:
+    # Weak: same data ka JSON byte-for-byte same hona zaroori nahi
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match weak comparison use karta hai
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+
+def as_utc(value: datetime) -> datetime:
+    # DB TIMESTAMP naive UTC aata hai
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def is_not_modified(request: Request, validators: Validators) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # RFC 9110: If-None-Match ho toh If-Modified-Since ignore
+        return etag_matches(if_none_match, validators.etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and validators.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates second precision par hain
+        return as_utc(validators.last_modified).replace(microsecond=0) <= since
+    return False
+
+
+def validator_headers(validators: Validators) -> dict:
+    headers = {"etag": validators.etag, "cache-control": CATALOG_CACHE_CONTROL}
+    if validators.last_modified is not None:
+        headers["last-modified"] = format_datetime(as_utc(validators.last_modified), usegmt=True)
+    return headers
+
+
+def not_modified_response(validators: Validators) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(validators))
+
+
+def conditional_json_response(body: bytes, validators: Validators) -> Response:
+    return Response(content=body, media_type="application/json", headers=validator_headers(validators))
@@ -0,0 +1,47 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import case, distinct, func, literal_column
+from decouple import config, Csv
+
+from app.product.models import Category, Product, product_category_table
+
+
+# Price histogram edges: [0, 25), [25, 50), ... [2500, inf)
+FACET_PRICE_EDGES = config("FACET_PRICE_EDGES", default="0,25,50,100,250,500,1000,2500", cast=Csv(float))
+
+
+# CATEGORY COUNTS
+# Aik GROUP BY product_category par -- har category ke liye alag COUNT nahi, cost categories ki tadaad se linear nahi barhti.
+# Category filter khud yahan apply nahi hota (disjunctive facet): sidebar dusri categories ke counts bhi dikha sake.
+async def category_facet(session: AsyncSession, stmt) -> list[dict]:
+    facet_stmt = (
+        stmt.with_only_columns(Category.id, Category.name, func.count(distinct(Product.id)))
+        .join(product_category_table, product_category_table.c.product_id == Product.id)
+        .join(Category, Category.id == product_category_table.c.category_id)
+        .group_by(Category.id, Category.name)
+        .order_by(func.count(distinct(Product.id)).desc(), Category.id)
+    )
+    result = await session.execute(facet_stmt)
+    return [{"id": category_id, "name": name, "count": count} for category_id, name, count in result]
+
+
+# PRICE HISTOGRAM
+# CASE se bucket index, phir aik GROUP BY -- saare filters (category samet) apply
+async def price_facet(session: AsyncSession, stmt) -> list[dict]:
+    edges = sorted(FACET_PRICE_EDGES)
+    bucket = case(*[(Product.price < edge, index) for index, edge in enumerate(edges[1:])], else_=len(edges) - 1).label("bucket")
+    # GROUP BY alias se -- CASE dobara (naye bind params ke saath) render na ho
+    facet_stmt = stmt.with_only_columns(bucket, func.count(distinct(Product.id))).group_by(literal_column("bucket"))
+    counts = dict((await session.execute(facet_stmt)).all())
+
+    # Khali buckets bhi, taake UI ke liye shape fixed rahe
+    return [
+        {"min": low, "max": edges[index + 1] if index + 1 < len(edges) else None, "count": counts.get(index, 0)}
+        for index, low in enumerate(edges)
+    ]
+
+
+async def search_facets(session: AsyncSession, stmt_without_category, stmt) -> dict:
+    return {
+        "categories": await category_facet(session, stmt_without_category),
+        "price": await price_facet(session, stmt),
+    }
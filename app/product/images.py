@@ -0,0 +1,125 @@
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from decouple import config, Csv
+from pathlib import Path
+from uuid import uuid4
+import asyncio
+import os
+
+from app.account.log_config import logger
+from app.product.utils import UPLOAD_DIR
+
+
+IMAGE_VARIANT_WIDTHS = config("IMAGE_VARIANT_WIDTHS", default="64,128,256,512,1024", cast=Csv(int))
+IMAGE_VARIANT_WORKERS = config("IMAGE_VARIANT_WORKERS", default=2, cast=int)
+IMAGE_VARIANT_CACHE_MAX_BYTES = config("IMAGE_VARIANT_CACHE_MAX_BYTES", default=512 * 1024 * 1024, cast=int)
+PRODUCT_THUMBNAIL_WIDTH = config("PRODUCT_THUMBNAIL_WIDTH", default=256, cast=int)
+PRODUCT_THUMBNAIL_FORMAT = "webp"
+
+IMAGE_VARIANT_FORMATS = {"webp": "WEBP", "jpeg": "JPEG", "png": "PNG"}
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+VARIANT_DIR = UPLOAD_DIR / "variants"
+
+variant_executor: ProcessPoolExecutor | None = None
+# Same variant ki concurrent requests aik hi resize ka intezar karti hain
+variant_in_flight: dict[str, asyncio.Task] = {}
+
+
+# WORKER PROCESS
+def render_variant(source: str, target: str, width: int, image_format: str):
+    from PIL import Image
+
+    temp = f"{target}.{uuid4().hex}.part"
+    with Image.open(source) as image:
+        # Aspect ratio same, sirf chota karta hai -- bara nahi
+        image.thumbnail((width, width * 10))
+        if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.save(temp, image_format, quality=82)
+    os.replace(temp, target)
+
+
+def get_variant_executor() -> ProcessPoolExecutor:
+    global variant_executor
+    if variant_executor is None:
+        variant_executor = ProcessPoolExecutor(max_workers=IMAGE_VARIANT_WORKERS)
+    return variant_executor
+
+
+def variant_path(filename: str, width: int, image_format: str) -> Path:
+    return VARIANT_DIR / f"{Path(filename).stem}_w{width}.{image_format}"
+
+
+def variant_url(image_url: str | None, width: int = PRODUCT_THUMBNAIL_WIDTH, image_format: str = PRODUCT_THUMBNAIL_FORMAT) -> str | None:
+    if not image_url or Path(image_url).suffix.lower() not in IMAGE_EXTENSIONS:
+        return None
+    return f"/uploads/images/{Path(image_url).name}?w={width}&format={image_format}"
+
+
+# DISK CACHE EVICTION
+# Size limit se upar ho toh sab se purani (mtime) variants delete; hit par mtime touch hota hai, is liye ye LRU hai
+def evict_variants():
+    entries = []
+    total = 0
+    for entry in os.scandir(VARIANT_DIR):
+        if not entry.is_file() or entry.name.endswith(".part"):
+            continue
+        stat_result = entry.stat()
+        entries.append((stat_result.st_mtime, stat_result.st_size, entry.path))
+        total += stat_result.st_size
+
+    if total <= IMAGE_VARIANT_CACHE_MAX_BYTES:
+        return
+
+    entries.sort()
+    for _, size, path in entries:
+        if total <= IMAGE_VARIANT_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except FileNotFoundError:
+            pass
+
+
+async def generate_variant(source: Path, target: Path, width: int, image_format: str):
+    if not await run_in_threadpool(source.is_file):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    VARIANT_DIR.mkdir(parents=True, exist_ok=True)
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(get_variant_executor(), render_variant, str(source), str(target), width, IMAGE_VARIANT_FORMATS[image_format])
+    except Exception:
+        logger.exception("Image variant generation failed")
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail="Could not process image.")
+
+    await run_in_threadpool(evict_variants)
+
+
+async def get_variant(filename: str, width: int, image_format: str) -> Path:
+    if width not in IMAGE_VARIANT_WIDTHS or image_format not in IMAGE_VARIANT_FORMATS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported image variant.")
+
+    source = UPLOAD_DIR / "images" / filename
+    if source.suffix.lower() not in IMAGE_EXTENSIONS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Variants are only available for images.")
+
+    target = variant_path(filename, width, image_format)
+    try:
+        await run_in_threadpool(os.utime, target)
+        return target
+    except FileNotFoundError:
+        pass
+
+    key = str(target)
+    task = variant_in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(generate_variant(source, target, width, image_format))
+        variant_in_flight[key] = task
+        task.add_done_callback(lambda _: variant_in_flight.pop(key, None))
+
+    # shield: aik client disconnect ho toh baaki waiters ka resize cancel na ho
+    await asyncio.shield(task)
+    return target
@@ -0,0 +1,234 @@
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import case, select, update
+from datetime import datetime, timedelta, timezone
+from decouple import config
+import asyncio
+
+from app.account.log_config import logger
+from app.db.config import async_session
+from app.product.models import Product, StockReservation, StockReservationItem
+from app.product.schemas import ReservationItem
+
+
+# Checkout abandon ho jaye toh itne der baad stock wapas
+RESERVATION_TTL_SEC = config("RESERVATION_TTL_SEC", default=900, cast=int)
+RESERVATION_MAX_ITEMS = config("RESERVATION_MAX_ITEMS", default=100, cast=int)
+RESERVATION_SWEEP_SEC = config("RESERVATION_SWEEP_SEC", default=30, cast=float)
+RESERVATION_SWEEP_BATCH = config("RESERVATION_SWEEP_BATCH", default=500, cast=int)
+
+# Catalog cache yahan invalidate nahi hota: hot SKU par har reservation poora cache saaf kar deta.
+# Listing ka stock_quantity display ke liye hai (TTL tak purana ho sakta hai) -- asal check conditional UPDATE hai.
+
+
+def merge_items(items: list[ReservationItem]) -> dict[int, int]:
+    # Same product do dafa -- quantity jama. Product id order: har transaction rows aik hi tarteeb se lock kare (deadlock nahi)
+    quantities = {}
+    for item in items:
+        quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+    return dict(sorted(quantities.items()))
+
+
+def stock_update(quantities: dict[int, int], decrement: bool):
+    # Poora batch aik statement: stock_quantity = stock_quantity -/+ CASE id WHEN .. THEN n END WHERE id IN (..)
+    # InnoDB IN list ke rows PK order mein lock karta hai
+    delta = case(quantities, value=Product.id)
+    stock = Product.stock_quantity - delta if decrement else Product.stock_quantity + delta
+    stmt = (
+        update(Product)
+        .where(Product.id.in_(list(quantities)))
+        .values(stock_quantity=stock)
+        .execution_options(synchronize_session=False)
+    )
+    if decrement:
+        # Sirf wahi rows jin mein poora stock hai -- rowcount kam aaye toh koi item short hai
+        stmt = stmt.where(Product.stock_quantity >= delta)
+    return stmt
+
+
+async def find_shortages(session: AsyncSession, quantities: dict[int, int]) -> list[dict]:
+    result = await session.execute(select(Product.id, Product.stock_quantity).where(Product.id.in_(list(quantities))))
+    available = dict(result.all())
+    return [
+        {"product_id": product_id, "requested": quantity, "available": available.get(product_id, 0)}
+        for product_id, quantity in quantities.items()
+        if available.get(product_id, 0) < quantity
+    ]
+
+
+def reservation_payload(reservation_id: int, reservation_status: str, expires_at: datetime, quantities: dict[int, int]) -> dict:
+    # DB se wapas parha TIMESTAMP naive aata hai (UTC mein store) -- reserve wala aware, response mein aik hi format
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return {
+        "id": reservation_id,
+        "status": reservation_status,
+        "expires_at": expires_at,
+        "items": [{"product_id": product_id, "quantity": quantity} for product_id, quantity in quantities.items()],
+    }
+
+
+##############################################
+################ RESERVE #####################
+##############################################
+
+# Read-modify-write nahi: aik conditional UPDATE sab items ke liye, phir reservation insert, aik transaction.
+# Row locks sirf is chhoti transaction tak -- checkout ke poore flow tak nahi.
+async def reserve_stock(session: AsyncSession, user_id: int | None, items: list[ReservationItem]) -> dict:
+    quantities = merge_items(items)
+    if len(quantities) > RESERVATION_MAX_ITEMS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"At most {RESERVATION_MAX_ITEMS} products per reservation.")
+
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=RESERVATION_TTL_SEC)
+    try:
+        result = await session.execute(stock_update(quantities, decrement=True))
+        if result.rowcount != len(quantities):
+            # Kuch bhi reserve nahi hua -- rollback, phir report ke liye stock parho
+            await session.rollback()
+            shortages = await find_shortages(session, quantities)
+            await session.rollback()
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail={"message": "Insufficient stock", "items": shortages})
+
+        reservation = StockReservation(
+            user_id=user_id,
+            status="pending",
+            expires_at=expires_at,
+            items=[StockReservationItem(product_id=product_id, quantity=quantity) for product_id, quantity in quantities.items()],
+        )
+        session.add(reservation)
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error(f"Stock reservation failed: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Could not reserve stock")
+
+    return reservation_payload(reservation.id, "pending", expires_at, quantities)
+
+
+##############################################
+################ COMMIT / RELEASE ############
+##############################################
+
+def owned_by(user_id: int | None):
+    # Admin (user_id None) kisi ki bhi reservation chala sakta hai
+    return [] if user_id is None else [StockReservation.user_id == user_id]
+
+
+async def reservation_conflict(session: AsyncSession, reservation_id: int, user_id: int | None):
+    # Conditional UPDATE ne kuch nahi badla -- 404 (nahi mili / kisi aur ki) ya 409 (pending nahi rahi)
+    stmt = select(StockReservation.status).where(StockReservation.id == reservation_id, *owned_by(user_id))
+    current = await session.scalar(stmt)
+    await session.rollback()
+    if current is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Reservation is {current}, not pending")
+
+
+async def reservation_quantities(session: AsyncSession, reservation_id: int) -> dict[int, int]:
+    stmt = (
+        select(StockReservationItem.product_id, StockReservationItem.quantity)
+        .where(StockReservationItem.reservation_id == reservation_id)
+        .order_by(StockReservationItem.product_id)
+    )
+    return dict((await session.execute(stmt)).all())
+
+
+# Stock reserve par hi ghat chuka -- commit sirf status badalta hai (expiry se pehle)
+async def commit_reservation(session: AsyncSession, reservation_id: int, user_id: int | None) -> dict:
+    now = datetime.now(timezone.utc)
+    stmt = (
+        update(StockReservation)
+        .where(StockReservation.id == reservation_id, StockReservation.status == "pending", StockReservation.expires_at > now, *owned_by(user_id))
+        .values(status="committed")
+    )
+    try:
+        result = await session.execute(stmt)
+        if result.rowcount != 1:
+            await reservation_conflict(session, reservation_id, user_id)
+        quantities = await reservation_quantities(session, reservation_id)
+        expires_at = await session.scalar(select(StockReservation.expires_at).where(StockReservation.id == reservation_id))
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error(f"Reservation commit failed: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Could not commit reservation")
+
+    return reservation_payload(reservation_id, "committed", expires_at, quantities)
+
+
+async def restore_reservation(session: AsyncSession, reservation_id: int, new_status: str, *conditions) -> dict[int, int] | None:
+    # Pehle status (pending -> released/expired) conditional UPDATE se: release aur sweeper dono aik hi reservation
+    # par chalen toh bhi stock sirf aik dafa wapas hota hai. Caller commit karta hai.
+    stmt = (
+        update(StockReservation)
+        .where(StockReservation.id == reservation_id, StockReservation.status == "pending", *conditions)
+        .values(status=new_status)
+    )
+    result = await session.execute(stmt)
+    if result.rowcount != 1:
+        return None
+
+    quantities = await reservation_quantities(session, reservation_id)
+    if quantities:
+        await session.execute(stock_update(quantities, decrement=False))
+    return quantities
+
+
+async def release_reservation(session: AsyncSession, reservation_id: int, user_id: int | None) -> dict:
+    try:
+        quantities = await restore_reservation(session, reservation_id, "released", *owned_by(user_id))
+        if quantities is None:
+            await reservation_conflict(session, reservation_id, user_id)
+        expires_at = await session.scalar(select(StockReservation.expires_at).where(StockReservation.id == reservation_id))
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error(f"Reservation release failed: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Could not release reservation")
+
+    return reservation_payload(reservation_id, "released", expires_at, quantities)
+
+
+##############################################
+################ EXPIRY ######################
+##############################################
+
+# Har reservation apni chhoti transaction mein -- sweeper lambe locks nahi rakhta. Kai workers saath chalen toh bhi safe.
+async def expire_reservations(limit: int = RESERVATION_SWEEP_BATCH) -> int:
+    now = datetime.now(timezone.utc)
+    expired = 0
+    async with async_session() as session:
+        stmt = (
+            select(StockReservation.id)
+            .where(StockReservation.status == "pending", StockReservation.expires_at <= now)
+            .order_by(StockReservation.expires_at)
+            .limit(limit)
+        )
+        reservation_ids = (await session.scalars(stmt)).all()
+        await session.rollback()
+
+        for reservation_id in reservation_ids:
+            try:
+                if await restore_reservation(session, reservation_id, "expired", StockReservation.expires_at <= now) is not None:
+                    expired += 1
+                await session.commit()
+            except SQLAlchemyError as e:
+                await session.rollback()
+                logger.error(f"Reservation expiry failed for {reservation_id}: {e}")
+    return expired
+
+
+async def expiry_loop():
+    while True:
+        await asyncio.sleep(RESERVATION_SWEEP_SEC)
+        try:
+            expired = await expire_reservations()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Koi bhi error (driver OSError waghera) loop band na kare -- warna expired stock kabhi wapas nahi aata
+            logger.exception("Reservation sweep failed")
+            continue
+        if expired:
+            logger.info(f"Expired {expired} stock reservations")
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Integer, Float, DateTime, TIMESTAMP, ForeignKey, Table, Column, text, Text
+from sqlalchemy.dialects import mysql
+from sqlalchemy import String, Integer, Numeric, DateTime, TIMESTAMP, ForeignKey, Table, Column, Index, text, Text
 from datetime import timezone, datetime
 
 from app.db.base import Base
@@ -12,7 +13,9 @@ product_category_table = Table(
     "product_category",
     Base.metadata,
     Column("product_id", Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True),
-    Column("category_id", Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    Column("category_id", Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True),
+    # PK (product_id, category_id) category filter mein kaam nahi aata -- ulta composite
+    Index("ix_product_category_category_id_product_id", "category_id", "product_id"),
 )
 
 
@@ -23,7 +26,9 @@ class Product(Base):
     title: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     description: Mapped[str] = mapped_column(Text, nullable=True)
     slug: Mapped[str] = mapped_column(Text, unique=True, nullable=False) # some databases doesn't support text with Unique
-    price: Mapped[float] = mapped_column(Float, nullable=False)
+    # DECIMAL, FLOAT nahi: keyset cursor ki value (19.99) stored value se exact match kare -- single precision FLOAT
+    # par price = :v kabhi match nahi hota aur same price wale rows skip / repeat hote hain. Python side float hi rehta hai.
+    price: Mapped[float] = mapped_column(Numeric(10, 2, asdecimal=False), nullable=False)
     stock_quantity: Mapped[int] = mapped_column(default=0)
     image_url: Mapped[str] = mapped_column(String(255), nullable=False)
 
@@ -32,9 +37,10 @@ class Product(Base):
         server_default=text("CURRENT_TIMESTAMP"),
         nullable=False
     )
+    # Microseconds: conditional GET ka ETag isi se banta hai -- aik second mein do writes same version na dein
     updated_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(),
-        server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
+        mysql.TIMESTAMP(fsp=6),
+        server_default=text("CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)"),
         nullable=False
     )
 
@@ -44,6 +50,17 @@ class Product(Base):
         back_populates="products",
   
     ) # lazy="selectin"
+
+    # FULLTEXT indexes search ke liye (MATCH ... AGAINST), LIKE '%term%' poori table scan karta tha
+    __table_args__ = (
+        Index("ft_products_title", "title", mysql_prefix="FULLTEXT"),
+        Index("ft_products_description", "description", mysql_prefix="FULLTEXT"),
+        # sort=price_asc|price_desc aur sort=newest ke ORDER BY + keyset seek ke liye
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_created_at_id", "created_at", "id"),
+        # Conditional GET ka catalog version: max(updated_at) index ke aakhri entry se
+        Index("ix_products_updated_at", "updated_at"),
+    )
     
 
 
@@ -65,3 +82,31 @@ class Category(Base):
 
 
 
+
+
+# STOCK RESERVATIONS
+# Reserve par stock foran ghat'ta hai (conditional UPDATE), commit sirf status badalta hai,
+# release/expiry stock wapas karta hai. status: pending | committed | released | expired
+class StockReservation(Base):
+    __tablename__ = "stock_reservations"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, server_default="pending")
+    expires_at: Mapped[datetime] = mapped_column(TIMESTAMP, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=text("CURRENT_TIMESTAMP"), nullable=False)
+
+    items: Mapped[list["StockReservationItem"]] = relationship("StockReservationItem", cascade="all, delete-orphan")
+
+    # Expiry sweeper: WHERE status = 'pending' AND expires_at < now
+    __table_args__ = (
+        Index("ix_stock_reservations_status_expires_at", "status", "expires_at"),
+    )
+
+
+class StockReservationItem(Base):
+    __tablename__ = "stock_reservation_items"
+
+    reservation_id: Mapped[int] = mapped_column(ForeignKey("stock_reservations.id", ondelete="CASCADE"), primary_key=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id", ondelete="CASCADE"), primary_key=True, index=True)
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 
 from app.account.dependency import require_admin
 from app.account.models import User
 from app.product.schemas import CategoryCreate, CategoryOut
 from app.db.config import SessionDep
-from app.product.services import create_category, delete_cat, get_all_cat, get_single_cat
+from app.db.routing import ReadSessionDep
+from app.product.services import category_validators, create_category, delete_cat, get_all_cat, get_single_cat
+from app.product.conditional import conditional_json_response, is_not_modified, not_modified_response
 
 
 
@@ -18,11 +20,14 @@ async def category_create(session: SessionDep, category: CategoryCreate, admin_u
     return await create_category(session, category)
 
 @router.get("/all-categories", response_model=list[CategoryOut])
-async def all_categories(session: SessionDep):
-    return await get_all_cat(session)
+async def all_categories(request: Request, session: ReadSessionDep):
+    validators = await category_validators(session)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+    return conditional_json_response(await get_all_cat(session), validators)
 
 @router.get("/single-cat/{id}", response_model=CategoryOut)
-async def single_category(session: SessionDep, id: int):
+async def single_category(session: ReadSessionDep, id: int):
     return await get_single_cat(session, id)
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+
+from app.account.dependency import is_authenticated
+from app.account.models import User
+from app.db.config import SessionDep
+from app.product.inventory import commit_reservation, release_reservation, reserve_stock
+from app.product.schemas import ReservationCreate, ReservationOut
+
+
+
+
+router = APIRouter(prefix="/api/inventory", tags=["Inventory"])
+
+
+def owner_filter(user: User) -> int | None:
+    # Admin kisi bhi reservation ko commit/release kar sakta hai
+    return None if user.is_admin else user.id
+
+
+@router.post("/reservations", response_model=ReservationOut)
+async def reservation_create(session: SessionDep, reservation: ReservationCreate, user: User = Depends(is_authenticated)):
+    return await reserve_stock(session, user.id, reservation.items)
+
+@router.post("/reservations/{id}/commit", response_model=ReservationOut)
+async def reservation_commit(session: SessionDep, id: int, user: User = Depends(is_authenticated)):
+    return await commit_reservation(session, id, owner_filter(user))
+
+@router.post("/reservations/{id}/release", response_model=ReservationOut)
+async def reservation_release(session: SessionDep, id: int, user: User = Depends(is_authenticated)):
+    return await release_reservation(session, id, owner_filter(user))
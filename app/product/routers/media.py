@@ -0,0 +1,56 @@
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+import re
+
+from app.product.conditional import etag_matches
+from app.product.images import get_variant
+from app.product.utils import ALLOWED_EXTENSIONS, UPLOAD_DIR
+
+
+router = APIRouter(prefix="/uploads", tags=["Media"])
+
+# Sirf seedha filename -- "../" ya sub-path allowed nahi
+FILENAME_RE = re.compile(r"^[A-Za-z0-9_-]+\.[a-z0-9]+$")
+CONTENT_HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# Content-addressed files kabhi change nahi hoti, browser/CDN saal bhar rakh sakte hain
+MEDIA_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/images/{filename}")
+async def serve_image(request: Request, filename: str, w: int | None = Query(default=None), format: str | None = Query(default=None)):
+    path = UPLOAD_DIR / "images" / filename
+    if not FILENAME_RE.match(filename) or path.suffix.lower() not in ALLOWED_EXTENSIONS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    # ?w=256&format=webp -> thumbnail variant (pehli dafa process pool mein banta hai, phir disk cache se)
+    if w is not None or format is not None:
+        if w is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Variant width is required.")
+        image_format = format or "webp"
+        headers = {"cache-control": MEDIA_CACHE_CONTROL}
+        if CONTENT_HASH_RE.match(path.stem):
+            headers["etag"] = f'"{path.stem}-w{w}.{image_format}"'
+            if_none_match = request.headers.get("if-none-match")
+            if if_none_match and etag_matches(if_none_match, headers["etag"]):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        path = await get_variant(filename, w, image_format)
+        return FileResponse(path, headers=headers)
+
+    try:
+        stat_result = await run_in_threadpool(path.stat)
+    except (FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    headers = {"cache-control": MEDIA_CACHE_CONTROL}
+
+    # Naam hi sha256 hai toh strong ETag wahi; purani uuid files par FileResponse mtime/size wala ETag lagata hai
+    if CONTENT_HASH_RE.match(path.stem):
+        headers["etag"] = f'"{path.stem}"'
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, headers["etag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # FileResponse: Range requests, aur server "http.response.pathsend" support kare toh zero-copy send
+    return FileResponse(path, headers=headers, stat_result=stat_result)
@@ -1,11 +1,17 @@
-from typing import Annotated
-from fastapi import APIRouter, Depends, UploadFile, status, File, Form, HTTPException, Query
+from typing import Annotated, Literal
+from fastapi import APIRouter, Depends, Request, UploadFile, File, Form, Query
+from fastapi.responses import Response, StreamingResponse
 
 from app.account.dependency import require_admin
 from app.account.models import User
 from app.db.config import SessionDep
-from app.product.schemas import PaginatedProductOut, ProductCreate, ProductOut
-from app.product.services import create_product, get_all_products, get_item_by_slug, search_product
+from app.db.routing import ReadSessionDep
+from app.product.bulk import bulk_import_products, export_products, iter_csv_rows, iter_lines, iter_ndjson_rows
+from app.product.schemas import BulkImportReport, PaginatedProductOut, ProductBatchOut, ProductCreate, ProductOut, SuggestionOut
+from app.product.cache import catalog_cache, count_cache
+from app.product.services import create_product, get_all_products, get_item_by_slug, get_products_batch, get_suggestions, product_validators, products_validators, search_product, search_validators
+from app.product.suggest import suggest_index
+from app.product.conditional import conditional_json_response, is_not_modified, not_modified_response
 
 
 
@@ -16,6 +22,9 @@ from app.product.services import create_product, get_all_products, get_item_by_s
 
 router = APIRouter(prefix="/api/products", tags=["Products"])
 
+CountStrategy = Literal["exact", "cached", "estimated", "none"]
+SortOption = Literal["price_asc", "price_desc", "newest", "title"]
+
 
 @router.post("/create-product", response_model=ProductOut)
 async def product_create(session: SessionDep,
@@ -37,32 +46,102 @@ async def product_create(session: SessionDep,
     return await create_product(session, data, image)
 
 
+# BULK IMPORT -- body NDJSON ya CSV stream, poori file memory mein nahi aati
+@router.post("/bulk-import", response_model=BulkImportReport)
+async def product_bulk_import(session: SessionDep, request: Request,
+    format: Literal["ndjson", "csv"] | None = Query(default=None),
+    admin_user: User = Depends(require_admin)):
+
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+
+    lines = iter_lines(request.stream())
+    rows = iter_csv_rows(lines) if format == "csv" else iter_ndjson_rows(lines)
+    return await bulk_import_products(session, rows)
+
+
+# EXPORT -- server-side cursor se stream, memory catalog size par depend nahi karti
+@router.get("/export")
+async def product_export(format: Literal["ndjson", "csv"] = Query(default="ndjson"), admin_user: User = Depends(require_admin)):
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export_products(format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="products.{format}"'},
+    )
+
+
 @router.get("", response_model=PaginatedProductOut)
-async def product_get_all(session: SessionDep, category_name: list[str]|None=Query(default=None), limit: int = Query(default=5, ge=1,le=100), page: int =Query(default=1, ge=1)):
-    return await get_all_products(session, category_name,limit, page)
+async def product_get_all(request: Request, session: ReadSessionDep, category_name: list[str]|None=Query(default=None), limit: int = Query(default=5, ge=1,le=100), page: int =Query(default=1, ge=1), cursor: str|None=Query(default=None), count: CountStrategy = Query(default="exact"), sort: SortOption | None = Query(default=None)):
+    # Pehle validators (sasti aggregate / cache) -- match par 304, page query aur serialization skip
+    validators = await products_validators(session, category_name, limit, page, cursor, count, sort)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+    return conditional_json_response(await get_all_products(session, category_name,limit, page, cursor, count, sort), validators)
 
 @router.get("/search", response_model=PaginatedProductOut)
 async def product_search(
-                         session: SessionDep, 
+                         request: Request,
+                         session: ReadSessionDep, 
                          category_name: list[str]|None=Query(default=None),
                          title: str |None=Query(default=None),
                          description: str|None=Query(default=None),
                          min_price: float|None=Query(default=None),
                          max_price: float|None=Query(default=None),
                          limit: int = 5,
-                         page: int = 1
+                         page: int = 1,
+                         cursor: str|None=Query(default=None),
+                         count: CountStrategy = Query(default="exact"),
+                         facets: bool = Query(default=False),
+                         sort: SortOption | None = Query(default=None)
 ):
-    return await search_product(session=session, 
-                                category_name=category_name,
-                                title=title,
-                                description=description, 
-                                min_price=min_price, 
-                                max_price=max_price, 
-                                limit=limit, 
-                                page=page)
+    filters = dict(category_name=category_name,
+                   title=title,
+                   description=description, 
+                   min_price=min_price, 
+                   max_price=max_price, 
+                   limit=limit, 
+                   page=page,
+                   cursor=cursor,
+                   count=count,
+                   facets=facets,
+                   sort=sort)
+    validators = await search_validators(session, **filters)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+    return conditional_json_response(await search_product(session=session, **filters), validators)
+
+
+# AUTOCOMPLETE -- har keystroke par search + COUNT ki jagah in-memory prefix index
+@router.get("/suggest", response_model=list[SuggestionOut])
+async def product_suggest(q: str = Query(min_length=1, max_length=100), limit: int = Query(default=8, ge=1, le=20)):
+    return Response(content=get_suggestions(q, limit), media_type="application/json")
+
+
+# BATCH -- ?slugs=a&slugs=b ya ?ids=1&ids=2, aik request mein saare line items
+@router.get("/batch", response_model=ProductBatchOut)
+async def product_batch(session: ReadSessionDep, slugs: list[str]|None=Query(default=None), ids: list[int]|None=Query(default=None)):
+    return Response(content=await get_products_batch(session, slugs, ids), media_type="application/json")
+
+
+@router.get("/cache-stats")
+async def cache_stats(admin_user: User = Depends(require_admin)):
+    # Stats bhi per worker process hain
+    return {"catalog": catalog_cache.stats(), "count": count_cache.stats()}
+
+
+@router.get("/suggest-stats")
+async def suggest_stats(admin_user: User = Depends(require_admin)):
+    return suggest_index.stats()
 
 
 @router.get("/{slug}", response_model=ProductOut)
-async def product_by_slug(session:SessionDep, slug: str):
-    return await get_item_by_slug(session, slug)
+async def product_by_slug(request: Request, session:ReadSessionDep, slug: str):
+    validators = await product_validators(session, slug)
+    if validators is None:
+        # get_item_by_slug 404 raise karega
+        return await get_item_by_slug(session, slug)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+    return conditional_json_response(await get_item_by_slug(session, slug), validators)
 
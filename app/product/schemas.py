@@ -1,4 +1,8 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
+from typing import Literal
+from datetime import datetime
+
+from app.product.images import variant_url
 
 
 ##############################################
@@ -43,9 +47,83 @@ class ProductOut(ProductBase):
         "from_attributes": True
     }
 
+    # List pages full image ki jagah ye thumbnail link use karein
+    @computed_field
+    @property
+    def thumbnail_url(self) -> str | None:
+        return variant_url(self.image_url)
+
+
+class BulkImportRowError(BaseModel):
+    row: int
+    errors: list[str]
+
+
+class BulkImportReport(BaseModel):
+    processed: int
+    created: int
+    failed: int
+    errors: list[BulkImportRowError]
+    errors_truncated: bool = False
+
+
+class CategoryFacet(BaseModel):
+    id: int
+    name: str
+    count: int
+
+
+class PriceBucket(BaseModel):
+    min: float
+    max: float | None = None # aakhri bucket open-ended
+    count: int
+
+
+class SearchFacets(BaseModel):
+    categories: list[CategoryFacet]
+    price: list[PriceBucket]
+
+
+class ProductBatchOut(BaseModel):
+    items: list[ProductOut] # request wali order mein
+    not_found: list[str | int] = []
+
+
+class SuggestionOut(BaseModel):
+    type: Literal["product", "category"]
+    id: int
+    label: str
+    slug: str | None = None # sirf products ka
+
 
 class PaginatedProductOut(BaseModel):
-    total: int
-    page: int
+    total: int | None = None # count=none par None
+    page: int | None = None # cursor mode mein page None hota hai
     limit: int
-    items: list[ProductOut]
\ No newline at end of file
+    items: list[ProductOut]
+    next_cursor: str | None = None
+    has_more: bool = False
+    count_strategy: Literal["exact", "cached", "estimated", "none"] = "exact"
+    facets: SearchFacets | None = None # sirf /search?facets=true par
+
+
+##############################################
+################ INVENTORY ###################
+##############################################
+
+class ReservationItem(BaseModel):
+    product_id: int
+    quantity: int = Field(gt=0)
+
+
+class ReservationCreate(BaseModel):
+    items: list[ReservationItem] = Field(min_length=1)
+
+
+class ReservationOut(BaseModel):
+    id: int
+    status: Literal["pending", "committed", "released", "expired"]
+    expires_at: datetime
+    items: list[ReservationItem]
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,65 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.mysql import match
+from decouple import config, Csv
+import re
+
+from app.product.models import Product
+
+
+# InnoDB innodb_ft_min_token_size se chote words index mein hote hi nahi
+FULLTEXT_MIN_TOKEN_SIZE = config("FULLTEXT_MIN_TOKEN_SIZE", default=3, cast=int)
+# InnoDB ki default stopword list (innodb_ft_server_stopword_table set ho toh wahi list yahan dein). Boolean mode mein
+# "+for*" jaisa zaroori stopword poore query ko khali kar deta hai -- "case for iphone" ka koi result nahi aata.
+FULLTEXT_STOPWORDS = frozenset(config(
+    "FULLTEXT_STOPWORDS",
+    default="a,about,an,are,as,at,be,by,com,de,en,for,from,how,i,in,is,it,la,of,on,or,that,the,this,to,was,what,when,where,who,will,with,und,www",
+    cast=Csv(),
+))
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str | None) -> list[str]:
+    if not text:
+        return []
+    return TOKEN_RE.findall(text.lower())
+
+
+def boolean_query(tokens: list[str]) -> str:
+    # "+iphone* +pro*" -> har word zaroori, prefix match (LIKE '%pho%' jaisa feel, lekin index se)
+    return " ".join(f"+{token}*" for token in tokens)
+
+
+def is_fulltext_session(session: AsyncSession) -> bool:
+    return session.get_bind().dialect.name in ("mysql", "mariadb")
+
+
+# SEARCH FILTERS + RELEVANCE
+def build_text_search(session: AsyncSession, title: str | None, description: str | None):
+    """Returns (filters, relevance). relevance None ho toh caller id order use kare."""
+    filters = []
+    scores = []
+
+    for column, text in ((Product.title, title), (Product.description, description)):
+        tokens = tokenize(text)
+        if not tokens:
+            continue
+
+        # Index wale words MATCH se zaroori; chote tokens ("15", "4k") aur stopwords index mein hote hi nahi -- woh sirf
+        # MATCH wale rows par LIKE se (purana result hi, lekin full scan nahi)
+        required = [token for token in tokens if len(token) >= FULLTEXT_MIN_TOKEN_SIZE and token not in FULLTEXT_STOPWORDS]
+
+        if is_fulltext_session(session) and required:
+            score = match(column, against=boolean_query(required)).in_boolean_mode()
+            filters.append(score > 0)
+            filters.extend(column.like(f"%{token}%") for token in tokens if token not in required)
+            scores.append(score)
+        else:
+            # Sirf chote tokens / stopwords, ya non-MySQL (SQLite dev/bench) -- purana LIKE fallback
+            filters.extend(column.like(f"%{token}%") for token in tokens)
+
+    relevance = None
+    for score in scores:
+        relevance = score if relevance is None else relevance + score
+
+    return filters, relevance
@@ -1,12 +1,21 @@
 from fastapi import HTTPException, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import and_, select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import DateTime, Integer, String, and_, distinct, exists, or_, select, func, text
+from pydantic import TypeAdapter
+from decouple import config
+from collections import defaultdict
+from datetime import datetime
+import math
 
 
-from app.product.models import Product, Category
-from app.product.schemas import CategoryCreate, CategoryOut, PaginatedProductOut, ProductCreate, ProductOut
-from app.product.utils import generate_slug, save_upload_file
+from app.product.models import Product, Category, product_category_table
+from app.product.schemas import CategoryCreate, CategoryOut, PaginatedProductOut, ProductBatchOut, ProductCreate, ProductOut, SuggestionOut
+from app.product.cache import cache_key, cached, count_cache, invalidate_catalog
+from app.product.conditional import Validators, make_etag
+from app.product.search import build_text_search
+from app.product.facets import search_facets
+from app.product.suggest import suggest_index
+from app.product.utils import decode_cursor, encode_cursor, generate_slug, save_upload_file
 
 
 ##############################################
@@ -22,14 +31,20 @@ async def create_category(session: AsyncSession, category: CategoryCreate)->Cate
     category = Category(name=category.name)
     session.add(category)
     await session.commit()
+    invalidate_catalog()
     await session.refresh(category)
+    suggest_index.add_category(category.id, category.name)
     return category
 
 # Get all Category
-async def get_all_cat(session: AsyncSession)-> list[CategoryOut]:
-    stmt = select(Category)
-    cat = await session.execute(stmt)
-    return cat.scalars().all()
+# JSON bytes return hote hain (route seedha Response bhejta hai) -- cache hit par na ORM, na pydantic
+async def get_all_cat(session: AsyncSession)-> bytes:
+    async def load():
+        stmt = select(Category.id, Category.name)
+        result = await session.execute(stmt)
+        return category_list_adapter.dump_json(category_list_adapter.validate_python(result.mappings().all()))
+
+    return await cached(cache_key("categories"), load)
 
 # Get Single Category
 async def get_single_cat(session: AsyncSession, id: int)->CategoryOut:
@@ -47,6 +62,8 @@ async def delete_cat(session: AsyncSession, id: int)->bool:
         return False
     await session.delete(stmt)
     await session.commit()
+    invalidate_catalog()
+    suggest_index.remove_category(id)
     return True
     
 
@@ -76,59 +93,235 @@ async def create_product(session: AsyncSession, product_data: ProductCreate, ima
 
     session.add(new_product)
     await session.commit()
+    invalidate_catalog()
     await session.refresh(new_product, ["categories"])
+    suggest_index.add_product(new_product.id, new_product.title, new_product.slug)
 
     return new_product
 
 
-# PRODUCT GET
-async def get_all_products(session: AsyncSession, category_name: list[str] | None = None, limit: int = 5, page: int = 1) -> dict:
-    stmt = select(Product).options(selectinload(Product.categories))
-
-    if category_name:
-        stmt = stmt.join(Product.categories).where(Category.name.in_(category_name)).distinct()
-    
-    count_stmt = stmt.with_only_columns(func.count(Product.id)).order_by(None)
-
-    total = await session.scalar(count_stmt)
-
-    stmt = stmt.limit(limit).offset((page-1)*limit)
-
-    result = await session.execute(stmt)
-
-    products = result.scalars().all()
+# FAST READ PATH
+# Catalog GETs ORM objects hydrate nahi karte: Core rows -> plain dicts -> pydantic aik dafa -> JSON bytes (cache mein bhi bytes).
+# Response model ke columns hi select hote hain.
+PRODUCT_OUT_COLUMNS = [Product.id, Product.title, Product.description, Product.slug, Product.price, Product.stock_quantity, Product.image_url]
+
+category_list_adapter = TypeAdapter(list[CategoryOut])
+suggestion_list_adapter = TypeAdapter(list[SuggestionOut])
+
+
+async def load_product_categories(session: AsyncSession, product_ids: list[int]) -> dict[int, list[dict]]:
+    if not product_ids:
+        return {}
+    stmt = (
+        select(product_category_table.c.product_id, Category.id, Category.name)
+        .join(Category, Category.id == product_category_table.c.category_id)
+        .where(product_category_table.c.product_id.in_(product_ids))
+    )
+    categories = defaultdict(list)
+    for product_id, category_id, name in await session.execute(stmt):
+        categories[product_id].append({"id": category_id, "name": name})
+    return categories
+
+
+async def product_payloads(session: AsyncSession, rows: list[dict]) -> list[dict]:
+    categories = await load_product_categories(session, [row["id"] for row in rows])
+    for row in rows:
+        row["categories"] = categories.get(row["id"], [])
+    return rows
+
+
+# SORT OPTIONS
+# Har option ka apna composite index hai (price, id) / (created_at, id) / title -- ORDER BY + keyset seek index se, filesort nahi.
+# Tie-breaker id ki direction sort wali hi, taake index aik hi direction mein scan ho.
+SORT_OPTIONS = {
+    "price_asc": [(Product.price, False), (Product.id, False)],
+    "price_desc": [(Product.price, True), (Product.id, True)],
+    "newest": [(Product.created_at, True), (Product.id, True)],
+    "title": [(Product.title, False), (Product.id, False)],
+}
+
+
+# PAGINATION (OFFSET + KEYSET)
+# Sort keys (expression, descending) ke end par hamesha Product.id hota hai taake order stable rahe:
+# naye inserts end par aate hain, is liye pages repeat/miss nahi hote.
+def cursor_value(expr, value):
+    # Cursor client ke haath se aata hai -- har value apne sort key ke type ka scalar ho, warna (list/dict/bool) driver tak ja kar 500
+    if isinstance(expr.type, DateTime):
+        # datetime cursor mein ISO string ban kar jata hai
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value)
+            except ValueError:
+                pass
+    elif isinstance(expr.type, Integer):
+        if isinstance(value, int) and not isinstance(value, bool) and -2**63 <= value < 2**63:
+            return value
+    elif isinstance(expr.type, String):
+        if isinstance(value, str):
+            return value
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        # price (DECIMAL) aur relevance score
+        try:
+            value = float(value)
+        except OverflowError:
+            value = math.inf
+        if math.isfinite(value):
+            return value
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+
+
+def keyset_condition(sort_keys: list, values: list):
+    conditions = []
+    for i, (expr, descending) in enumerate(sort_keys):
+        equal_before = [sort_keys[j][0] == values[j] for j in range(i)]
+        after = expr < values[i] if descending else expr > values[i]
+        conditions.append(and_(*equal_before, after))
+    return or_(*conditions)
+
+
+# TOTAL COUNT STRATEGIES
+# exact: COUNT query | cached: filter ke hisaab se TTL cache | estimated: MySQL statistics | none: count skip, sirf has_more
+async def estimate_count(session: AsyncSession, count_stmt) -> int | None:
+    dialect = session.get_bind().dialect
+    if dialect.name not in ("mysql", "mariadb"):
+        return None
+
+    if count_stmt.whereclause is None:
+        stats_stmt = text("SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'products'")
+        return await session.scalar(stats_stmt)
+
+    # Optimizer ka apna andaza: driving table (outer query ki pehli row) ka rows * filtered%. Baaqi rows (EXISTS / subquery /
+    # semi-join tables) per outer row hain -- unhein multiply karna total ko kai guna bara deta hai.
+    compiled = count_stmt.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN {compiled}", params)
+
+    driving = next((row for row in result.mappings() if row["id"] == 1), None)
+    # Semi-join mein pehli row categories ho sakti hai (rows ~1), aur FULLTEXT access hamesha rows=1 batata hai --
+    # dono surton mein andaza bekaar, exact count par wapas
+    if driving is None or driving["table"] != "products" or driving["type"] == "fulltext":
+        return None
+    return int((driving["rows"] or 0) * (driving["filtered"] or 100) / 100)
+
+
+async def count_products(session: AsyncSession, stmt, count: str, count_key: tuple | None) -> tuple[int | None, str]:
+    count_stmt = stmt.with_only_columns(func.count(distinct(Product.id))).order_by(None)
+
+    if count == "none":
+        return None, "none"
+
+    if count == "estimated":
+        total = await estimate_count(session, count_stmt)
+        if total is not None:
+            return total, "estimated"
+        # Non-MySQL par statistics nahi, ya plan se andaza bharose ka nahi -- exact
+        count = "exact"
+
+    if count == "cached" and count_key is not None:
+        async def load():
+            return await session.scalar(count_stmt)
+
+        return await cached(count_key, load, count_cache), "cached"
+
+    return await session.scalar(count_stmt), "exact"
+
+
+def ordered_query(stmt, sort_keys: list | None):
+    """Returns (stmt, sort_keys) -- sort key values columns ke baad select, id tie-breaker ke saath."""
+    sort_keys = list(sort_keys or [])
+    if not sort_keys or sort_keys[-1][0] is not Product.id:
+        sort_keys.append((Product.id, False))
+    stmt = stmt.add_columns(*(expr for expr, _ in sort_keys))
+    stmt = stmt.order_by(*(expr.desc() if descending else expr for expr, descending in sort_keys))
+    return stmt, sort_keys
+
+
+async def paginate_products(session: AsyncSession, stmt, limit: int, page: int = 1, cursor: str | None = None, sort_keys: list | None = None,
+                            count: str = "exact", count_key: tuple | None = None) -> dict:
+    total, count_strategy = await count_products(session, stmt, count, count_key)
+
+    # Row = product columns + sort key values (cursor ke liye)
+    width = len(stmt.selected_columns)
+    stmt, sort_keys = ordered_query(stmt, sort_keys)
+
+    if cursor:
+        # KEYSET: WHERE (key) > (last key) -- deep pages bhi index se seek karte hain, offset scan nahi
+        values = decode_cursor(cursor)
+        if len(values) != len(sort_keys):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+        values = [cursor_value(expr, value) for (expr, _), value in zip(sort_keys, values)]
+        stmt = stmt.where(keyset_condition(sort_keys, values))
+        page = None
+    else:
+        stmt = stmt.offset((page-1)*limit)
+
+    # limit+1 fetch karo taake pata chale agla page hai ya nahi
+    result = await session.execute(stmt.limit(limit + 1))
+
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(list(rows[-1][width:]))
+
+    columns = [column.key for column in stmt.selected_columns][:width]
+    items = await product_payloads(session, [dict(zip(columns, row[:width])) for row in rows])
 
     return {
         "total": total,
         "page": page,
         "limit": limit,
-        "items": products
+        "items": items,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
+        "count_strategy": count_strategy
     }
 
 
-# SEARCH PRODUCT 
-async def search_product(session: AsyncSession, 
-                         category_name: list[str]|None=None,
-                         title: str |None=None,
-                         description: str|None=None,
-                         min_price: float|None=None,
-                         max_price: float|None=None,
-                         limit: int = 5,
-                         page: int = 1
-                        )-> dict: 
-#   FETCH PRODUCT FROM DB
-    stmt = select(Product).options(selectinload(Product.categories))                   
+# PRODUCT GET
+def products_query(category_name: list[str] | None = None):
+    stmt = select(*PRODUCT_OUT_COLUMNS)
 
     if category_name:
-        stmt = stmt.join(Product.categories).where(Category.name.in_(category_name)).distinct()
+        # EXISTS (semi-join) -- JOIN + DISTINCT temporary table banata tha aur sort index use nahi hota tha
+        in_category = exists().where(
+            product_category_table.c.product_id == Product.id,
+            product_category_table.c.category_id == Category.id,
+            Category.name.in_(category_name),
+        )
+        stmt = stmt.where(in_category)
+    return stmt
+
+
+async def get_all_products(session: AsyncSession, category_name: list[str] | None = None, limit: int = 5, page: int = 1, cursor: str | None = None, count: str = "exact", sort: str | None = None) -> bytes:
+    stmt = products_query(category_name)
+
+    count_key = cache_key("count:products", category_name=category_name)
+
+    async def load():
+        page_data = await paginate_products(session, stmt, limit, page, cursor, SORT_OPTIONS.get(sort), count=count, count_key=count_key)
+        return PaginatedProductOut.model_validate(page_data).model_dump_json().encode()
 
-    filter = []
+    key = cache_key("products", category_name=category_name, limit=limit, page=page, cursor=cursor, count=count, sort=sort)
+    return await cached(key, load)
 
-    if title: 
-        filter.append(Product.title.like(f"%{title}%"))
-    if description and description.strip():
-        filter.append(Product.description.like(f"%{description.strip()}%")) # Product.description.ilike("%iphone%")
 
+# SEARCH PRODUCT 
+def search_query(session: AsyncSession,
+                 category_name: list[str]|None=None,
+                 title: str |None=None,
+                 description: str|None=None,
+                 min_price: float|None=None,
+                 max_price: float|None=None,
+                 sort: str|None=None):
+    """Returns (stmt, sort_keys)."""
+#   FETCH PRODUCT FROM DB
+    stmt = products_query(category_name)
+
+    # FULLTEXT (MATCH ... AGAINST) title/description par, relevance ke hisaab se rank
+    filter, relevance = build_text_search(session, title, description)
 
     
     if min_price is not None and max_price is not None:
@@ -146,33 +339,159 @@ async def search_product(session: AsyncSession,
     if filter:
         stmt = stmt.where(and_(*filter))
 
-    count_stmt = stmt.with_only_columns(func.count(Product.id)).order_by(None)
+    # Explicit sort relevance ranking ki jagah le leta hai
+    if sort is not None:
+        sort_keys = SORT_OPTIONS[sort]
+    else:
+        sort_keys = [(relevance, True)] if relevance is not None else None
+    return stmt, sort_keys
+
+
+async def search_product(session: AsyncSession, 
+                         category_name: list[str]|None=None,
+                         title: str |None=None,
+                         description: str|None=None,
+                         min_price: float|None=None,
+                         max_price: float|None=None,
+                         limit: int = 5,
+                         page: int = 1,
+                         cursor: str | None = None,
+                         count: str = "exact",
+                         facets: bool = False,
+                         sort: str | None = None
+                        )-> bytes: 
+    stmt, sort_keys = search_query(session, category_name, title, description, min_price, max_price, sort)
+
+    count_key = cache_key("count:search", category_name=category_name, title=title, description=description,
+                          min_price=min_price, max_price=max_price)
+
+    async def load_facets():
+        stmt_without_category, _ = search_query(session, None, title, description, min_price, max_price)
+        return await search_facets(session, stmt_without_category, stmt)
+
+    async def load():
+        page_data = await paginate_products(session, stmt, limit, page, cursor, sort_keys, count=count, count_key=count_key)
+        if facets:
+            # Facets filter par depend karte hain, page par nahi -- alag key, saare pages share karte hain
+            facet_key = cache_key("facets:search", category_name=category_name, title=title, description=description,
+                                  min_price=min_price, max_price=max_price)
+            page_data["facets"] = await cached(facet_key, load_facets)
+        return PaginatedProductOut.model_validate(page_data).model_dump_json().encode()
+
+    key = cache_key("search", category_name=category_name, title=title, description=description,
+                    min_price=min_price, max_price=max_price, limit=limit, page=page, cursor=cursor, count=count, facets=facets, sort=sort)
+    return await cached(key, load)
+
+# AUTOCOMPLETE
+# In-memory prefix index se -- na DB, na catalog cache
+def get_suggestions(q: str, limit: int = 8) -> bytes:
+    return suggestion_list_adapter.dump_json(suggestion_list_adapter.validate_python(suggest_index.suggest(q, limit)))
+
+# FETCH SINGLE PRODUCT USING SLUG 
+async def get_item_by_slug(session: AsyncSession, slug: str)-> bytes:
+    async def load():
+        stmt = select(*PRODUCT_OUT_COLUMNS).where(Product.slug == slug)
+        result = await session.execute(stmt)
+        product = result.mappings().one_or_none()
 
-    total = await session.scalar(count_stmt)
+        if not product:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+        
+        # us kay against categories bhi utha lo 
+        payload = (await product_payloads(session, [dict(product)]))[0]
+        return ProductOut.model_validate(payload).model_dump_json().encode()
 
-    stmt = stmt.limit(limit).offset((page-1)*limit)
+    return await cached(cache_key("product", slug=slug), load)
 
-    result = await session.execute(stmt)
 
-    products = result.scalars().all()
+# BATCH LOOKUP
+# Cart/wishlist/order pages: N x /{slug} ki jagah aik IN query + aik category load
+PRODUCT_BATCH_MAX_ITEMS = config("PRODUCT_BATCH_MAX_ITEMS", default=200, cast=int)
 
-    return {
-        "total": total,
-        "page": page,
-        "limit": limit,
-        "items": products
-    }
 
-# FETCH SINGLE PRODUCT USING SLUG 
-async def get_item_by_slug(session: AsyncSession, slug: str)-> ProductOut|None:
-    stmt = select(Product).options(selectinload(Product.categories)).where(Product.slug == slug) # us kay against categories bhi utha lo 
-    result = await session.execute(stmt)
-    product = result.scalar_one_or_none()
+async def get_products_batch(session: AsyncSession, slugs: list[str] | None = None, ids: list[int] | None = None) -> bytes:
+    if bool(slugs) == bool(ids):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Provide either slugs or ids.")
 
-    if not product:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
-    
-    return ProductOut.model_validate(product)
+    column, keys = (Product.slug, slugs) if slugs else (Product.id, ids)
+    # Duplicates aik dafa, pehli position par
+    keys = list(dict.fromkeys(keys))
+    if len(keys) > PRODUCT_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"At most {PRODUCT_BATCH_MAX_ITEMS} products per request.")
+
+    result = await session.execute(select(*PRODUCT_OUT_COLUMNS).where(column.in_(keys)))
+    found = {row[column.key]: dict(row) for row in result.mappings()}
+    items = await product_payloads(session, [found[key] for key in keys if key in found])
+
+    payload = {"items": items, "not_found": [key for key in keys if key not in found]}
+    return ProductBatchOut.model_validate(payload).model_dump_json().encode()
+
+
+# CONDITIONAL GET VALIDATORS
+# Body banane se pehle sasta version (catalog cache mein bhi). Payload mein category names hain, is liye categories ka version bhi ETag mein.
+async def category_version(session: AsyncSession) -> tuple:
+    async def load():
+        result = await session.execute(select(func.count(Category.id), func.max(Category.id)))
+        return tuple(result.one())
+
+    return await cached(cache_key("version:categories"), load)
+
+
+# Listings ke liye filtered aggregate (max + COUNT) nahi -- woh har count strategy (none/cached/estimated) par poora
+# filtered set scan karta tha. Catalog ka version max(updated_at) (ix_products_updated_at) + max(id) (PK) -- dono aik index
+# lookup. updated_at microsecond precision par hai, insert/update (stock samet) dono isay badalte hain; max(id) naye rows
+# ka doosra saboot. Total ETag mein nahi -- body mein wahi total jo chuni hui count strategy deti hai.
+async def catalog_version(session: AsyncSession) -> tuple:
+    async def load():
+        result = await session.execute(select(func.max(Product.updated_at), func.max(Product.id)))
+        return tuple(result.one())
+
+    return await cached(cache_key("version:catalog"), load)
+
+
+async def listing_validators(session: AsyncSession, page_key: tuple) -> Validators:
+    last_modified, last_id = await catalog_version(session)
+    return Validators(make_etag(page_key, last_modified, last_id, await category_version(session)), last_modified)
+
+
+async def products_validators(session: AsyncSession, category_name: list[str] | None = None, limit: int = 5, page: int = 1, cursor: str | None = None, count: str = "exact", sort: str | None = None) -> Validators:
+    page_key = cache_key("products", category_name=category_name, limit=limit, page=page, cursor=cursor, count=count, sort=sort)
+    return await listing_validators(session, page_key)
+
+
+async def search_validators(session: AsyncSession,
+                            category_name: list[str]|None=None,
+                            title: str |None=None,
+                            description: str|None=None,
+                            min_price: float|None=None,
+                            max_price: float|None=None,
+                            limit: int = 5,
+                            page: int = 1,
+                            cursor: str | None = None,
+                            count: str = "exact",
+                            facets: bool = False,
+                            sort: str | None = None) -> Validators:
+    page_key = cache_key("search", category_name=category_name, title=title, description=description,
+                         min_price=min_price, max_price=max_price, limit=limit, page=page, cursor=cursor, count=count, facets=facets, sort=sort)
+    return await listing_validators(session, page_key)
+
+
+async def product_validators(session: AsyncSession, slug: str) -> Validators | None:
+    # Slug unique index se sirf (id, updated_at) -- None par route normal 404 path le
+    async def load():
+        result = await session.execute(select(Product.id, Product.updated_at).where(Product.slug == slug))
+        row = result.one_or_none()
+        return tuple(row) if row else None
+
+    row = await cached(cache_key("version:product", slug=slug), load)
+    if row is None:
+        return None
+    product_id, updated_at = row
+    return Validators(make_etag("product", product_id, updated_at, await category_version(session)), updated_at)
+
+
+async def category_validators(session: AsyncSession) -> Validators:
+    return Validators(make_etag("categories", await category_version(session)))
 
     
 
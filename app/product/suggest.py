@@ -0,0 +1,348 @@
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import select
+from decouple import config
+from array import array
+from bisect import bisect_left, bisect_right
+import asyncio
+import heapq
+import sys
+import time
+
+from app.account.log_config import logger
+from app.db.config import async_session
+from app.product.models import Category, Product
+from app.product.search import tokenize
+
+
+# Memory bound (approx bytes): is ke baad naye titles index nahi hote (stats mein truncated=True)
+SUGGEST_MAX_BYTES = config("SUGGEST_MAX_BYTES", default=256 * 1024 * 1024, cast=int)
+# Key = title ka word se shuru hone wala hissa, itne characters tak -- lamba query candidates par dobara check hota hai
+SUGGEST_KEY_LENGTH = config("SUGGEST_KEY_LENGTH", default=32, cast=int)
+SUGGEST_MAX_WORDS = config("SUGGEST_MAX_WORDS", default=8, cast=int)
+# Prefix range mein zyada se zyada itne candidates rank hote hain ("a" jaisa query poori array scan na kare)
+SUGGEST_SCAN_LIMIT = config("SUGGEST_SCAN_LIMIT", default=128, cast=int)
+SUGGEST_MEMO_ENTRIES = config("SUGGEST_MEMO_ENTRIES", default=10000, cast=int)
+# Dusre workers / direct DB writes yahan nahi aate -- periodic rebuild (0 = off)
+SUGGEST_REFRESH_SEC = config("SUGGEST_REFRESH_SEC", default=300, cast=float)
+SUGGEST_LOAD_BATCH_SIZE = config("SUGGEST_LOAD_BATCH_SIZE", default=5000, cast=int)
+# Naye items pehle chhoti sorted delta list mein (har write par sirf yahi sort hoti hai); is se bari ho toh main arrays
+# mein merge threadpool mein
+SUGGEST_DELTA_MAX_KEYS = config("SUGGEST_DELTA_MAX_KEYS", default=20000, cast=int)
+
+# Ranking mein categories pehle
+KIND_RANK = {"category": 0, "product": 1}
+
+# List slot (8) + array ref (4) per key
+KEY_OVERHEAD_BYTES = 12
+
+# Kisi bhi key character se bara -- prefix range ka upper bound
+PREFIX_END = "\U0010ffff"
+
+
+def normalize(text: str | None) -> str:
+    return " ".join(tokenize(text))
+
+
+def index_keys(label: str) -> list[str]:
+    # "Smart Phone Pro" -> "smart phone pro", "phone pro", "pro": beech ke word se bhi prefix match
+    tokens = tokenize(label)[:SUGGEST_MAX_WORDS]
+    return list(dict.fromkeys(" ".join(tokens[i:])[:SUGGEST_KEY_LENGTH] for i in range(len(tokens))))
+
+
+def entry_bytes(item: tuple, keys: list[str]) -> int:
+    # Item tuple + us ke strings + list slot, aur har key ka string + slots
+    item_size = sys.getsizeof(item) + sum(sys.getsizeof(value) for value in item) + 8
+    return item_size + sum(sys.getsizeof(key) + KEY_OVERHEAD_BYTES for key in keys)
+
+
+def index_items(items: list[tuple], first_ref: int, budget: int) -> tuple[list[tuple], int, int]:
+    """items -> ((key, ref) pairs, approx bytes, indexed item count). Budget khatam toh wahin ruk jata hai."""
+    pairs = []
+    size = 0
+    for offset, item in enumerate(items):
+        keys = index_keys(item[2])
+        item_size = entry_bytes(item, keys)
+        if size + item_size > budget:
+            return pairs, size, offset
+        pairs.extend((key, first_ref + offset) for key in keys)
+        size += item_size
+    return pairs, size, len(items)
+
+
+def sort_pairs(pairs: list[tuple]) -> tuple[list[str], array]:
+    pairs.sort()
+    return [key for key, _ in pairs], array("I", (ref for _, ref in pairs))
+
+
+def build_arrays(items: list[tuple]) -> tuple[list[str], array, int, int]:
+    """items -> (sorted keys, refs, approx bytes, indexed item count). CPU-heavy, threadpool mein chalta hai."""
+    pairs, size, indexed = index_items(items, 0, SUGGEST_MAX_BYTES)
+    keys, refs = sort_pairs(pairs)
+    return keys, refs, size, indexed
+
+
+def merge_pairs(keys: list[str], refs: array, pairs: list[tuple]) -> tuple[list[str], array]:
+    # Sorted pairs ko sorted arrays mein aik pass: beech ke hisse slice se copy (C speed), har key par list.insert (O(N)) nahi
+    merged_keys, merged_refs = [], array("I")
+    start = 0
+    for key, ref in pairs:
+        position = bisect_right(keys, key, start)
+        merged_keys.extend(keys[start:position])
+        merged_refs.extend(refs[start:position])
+        merged_keys.append(key)
+        merged_refs.append(ref)
+        start = position
+    merged_keys.extend(keys[start:])
+    merged_refs.extend(refs[start:])
+    return merged_keys, merged_refs
+
+
+class SuggestIndex:
+    """Sorted array prefix index: product titles + category names. Items (kind, id, label, slug)."""
+
+    def __init__(self):
+        self._keys: list[str] = []
+        self._refs = array("I")
+        self._items: list[tuple | None] = []
+        self._category_refs: dict[int, int] = {}
+        # Categories ke (key, ref) alag chhoti sorted list mein, har lookup par poori range -- scan limit sirf products par.
+        # Warna "phone ..." wale hazaron product keys "phones" category se pehle aa kar use limit se bahar kar dete.
+        self._category_keys: list[tuple] = []
+        # Abhi merge nahi hue (key, ref) pairs, sorted. Har write naya list banata hai (merge snapshot par chalta hai)
+        self._delta: list[tuple] = []
+        self._merge_task: asyncio.Task | None = None
+        self._memo: dict = {}
+        self.bytes = 0
+        self.truncated = False
+        self.ready = False
+        self.built_at = None
+        self.build_seconds = None
+        # Rebuild ke dauraan aane wale writes -- swap ke baad dobara apply
+        self._pending: list[tuple] | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    # LOOKUP
+    def suggest(self, q: str, limit: int = 8) -> list[dict]:
+        query = normalize(q)
+        if not query:
+            return []
+
+        # Har keystroke par wahi chote prefixes aate hain -- write par memo saaf
+        memo_key = (query, limit)
+        cached = self._memo.get(memo_key)
+        if cached is not None:
+            return cached
+
+        # Prefix range bisect se (dono sire) -- per-key startswith nahi
+        probe = query[:SUGGEST_KEY_LENGTH]
+        category_keys = self._category_keys
+        start = bisect_left(category_keys, (probe,))
+        end = bisect_left(category_keys, (probe + PREFIX_END,), start)
+        refs = [ref for _, ref in category_keys[start:end]]
+
+        start = bisect_left(self._keys, probe)
+        end = bisect_left(self._keys, probe + PREFIX_END, start, min(len(self._keys), start + SUGGEST_SCAN_LIMIT))
+        refs.extend(self._refs[start:end])
+
+        # Naye items jo abhi delta mein hain
+        delta = self._delta
+        start = bisect_left(delta, (probe,))
+        end = bisect_left(delta, (probe + PREFIX_END,), start, min(len(delta), start + SUGGEST_SCAN_LIMIT))
+        refs.extend(ref for _, ref in delta[start:end])
+
+        # Rebuild ke dauraan aaya write DB load mein bhi ho sakta hai -- (kind, id) se dedupe
+        items = self._items
+        candidates = {}
+        for ref in refs:
+            item = items[ref]
+            if item is not None:
+                candidates.setdefault(item[:2], item)
+
+        matches = candidates.values()
+        if len(query) > SUGGEST_KEY_LENGTH:
+            matches = [item for item in matches if query in normalize(item[2])]
+
+        # Categories pehle, shuru se match pehle, phir chote labels
+        top = heapq.nsmallest(limit, matches, key=lambda item: (KIND_RANK[item[0]], not item[2].lower().startswith(query), len(item[2]), item[2]))
+        result = [{"type": kind, "id": item_id, "label": label, "slug": slug} for kind, item_id, label, slug in top]
+
+        if len(self._memo) >= SUGGEST_MEMO_ENTRIES:
+            self._memo.clear()
+        self._memo[memo_key] = result
+        return result
+
+    # UPDATES (create_product / create_category / bulk import)
+    def _insert(self, new_items: list[tuple]):
+        # Poora batch aik saath: items append (O(1)), keys delta mein aik sort -- main arrays ko nahi chhoota
+        pairs, category_pairs = [], []
+        for item in new_items:
+            if item[0] == "category" and item[1] in self._category_refs:
+                continue
+            keys = index_keys(item[2])
+            item_size = entry_bytes(item, keys)
+            if self.bytes + item_size > SUGGEST_MAX_BYTES:
+                self.truncated = True
+                break
+            ref = len(self._items)
+            self._items.append(item)
+            if item[0] == "category":
+                self._category_refs[item[1]] = ref
+                category_pairs.extend((key, ref) for key in keys)
+            else:
+                pairs.extend((key, ref) for key in keys)
+            self.bytes += item_size
+
+        if category_pairs:
+            self._category_keys = sorted(self._category_keys + category_pairs)
+        if pairs:
+            delta = self._delta + pairs
+            delta.sort()
+            self._delta = delta
+            self._schedule_merge()
+
+    def _schedule_merge(self):
+        if self._merge_task is not None or len(self._delta) < SUGGEST_DELTA_MAX_KEYS:
+            return
+        try:
+            self._merge_task = asyncio.get_running_loop().create_task(self._merge_delta())
+        except RuntimeError:
+            # Loop ke bahar (script / benchmark) -- agle write ya rebuild par
+            pass
+
+    async def _merge_delta(self):
+        keys, refs, delta = self._keys, self._refs, self._delta
+        # Snapshot ke baad aane wale items ke refs is se bare hain
+        next_ref = len(self._items)
+        try:
+            merged_keys, merged_refs = await run_in_threadpool(merge_pairs, keys, refs, delta)
+        finally:
+            self._merge_task = None
+
+        # Beech mein rebuild ne arrays badal diye -- yeh merge purana hai, delta rebuild ke saath reset ho chuka
+        if self._keys is keys:
+            self._keys, self._refs = merged_keys, merged_refs
+            self._delta = [pair for pair in self._delta if pair[1] >= next_ref]
+            self._memo.clear()
+        self._schedule_merge()
+
+    def _apply(self, change: tuple):
+        action, item = change
+        self._memo.clear()
+        if action == "add":
+            self._insert(item)
+        else:
+            ref = self._category_refs.pop(item, None)
+            if ref is not None:
+                self._items[ref] = None
+                self._category_keys = [pair for pair in self._category_keys if pair[1] != ref]
+
+    def _record(self, change: tuple):
+        self._apply(change)
+        if self._pending is not None:
+            self._pending.append(change)
+
+    def add_product(self, product_id: int, title: str, slug: str):
+        self.add_products([(product_id, title, slug)])
+
+    def add_products(self, products: list[tuple[int, str, str]]):
+        self._record(("add", [("product", product_id, title, slug) for product_id, title, slug in products]))
+
+    def add_category(self, category_id: int, name: str):
+        self._record(("add", [("category", category_id, name, None)]))
+
+    def remove_category(self, category_id: int):
+        self._record(("remove", category_id))
+
+    # BUILD
+    async def load_items(self) -> tuple[list[tuple], list[tuple], list[tuple], int, bool]:
+        """Returns (items, category (key, ref) pairs, product pairs, approx bytes, truncated). Cap stream ke dauraan -- poori
+        table memory mein nahi aati."""
+        items, pairs = [], []
+        size = 0
+
+        async def take(batch: list[tuple]) -> bool:
+            nonlocal size
+            # Keys banana CPU ka kaam hai -- threadpool mein, loop free
+            batch_pairs, batch_size, indexed = await run_in_threadpool(index_items, batch, len(items), SUGGEST_MAX_BYTES - size)
+            items.extend(batch[:indexed])
+            pairs.extend(batch_pairs)
+            size += batch_size
+            return indexed == len(batch)
+
+        async with async_session() as session:
+            result = await session.execute(select(Category.id, Category.name))
+            categories_complete = await take([("category", category_id, name, None) for category_id, name in result])
+            category_pairs = sorted(pairs)
+            pairs.clear()
+            if not categories_complete:
+                return items, category_pairs, pairs, size, True
+
+            # Naye products pehle -- cap lage toh purane chhoot'te hain, aur baaqi rows DB se mangwaye hi nahi jate
+            stmt = select(Product.id, Product.title, Product.slug).order_by(Product.id.desc()).execution_options(yield_per=SUGGEST_LOAD_BATCH_SIZE)
+            result = await session.stream(stmt)
+            async for rows in result.partitions():
+                if not await take([("product", product_id, title, slug) for product_id, title, slug in rows]):
+                    await result.close()
+                    return items, category_pairs, pairs, size, True
+        return items, category_pairs, pairs, size, False
+
+    async def rebuild(self):
+        started = time.perf_counter()
+        self._pending = []
+        try:
+            items, category_pairs, pairs, size, truncated = await self.load_items()
+            keys, refs = await run_in_threadpool(sort_pairs, pairs)
+        except SQLAlchemyError as e:
+            logger.error(f"Suggest index build failed: {e}")
+            return
+        finally:
+            pending, self._pending = self._pending, None
+
+        self.truncated = truncated
+        self._keys, self._refs, self._items, self._delta = keys, refs, items, []
+        self._category_keys = category_pairs
+        self._category_refs = {item[1]: ref for ref, item in enumerate(self._items) if item[0] == "category"}
+        self.bytes = size
+        self._memo.clear()
+        for change in pending:
+            self._apply(change)
+
+        self.ready = True
+        self.built_at = time.time()
+        self.build_seconds = time.perf_counter() - started
+        logger.info("Suggest index built", extra=self.stats())
+
+    async def refresh_loop(self):
+        while True:
+            await asyncio.sleep(SUGGEST_REFRESH_SEC)
+            await self.rebuild()
+
+    async def start(self):
+        await self.rebuild()
+        if SUGGEST_REFRESH_SEC > 0:
+            self._refresh_task = asyncio.create_task(self.refresh_loop())
+
+    async def stop(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        if self._merge_task is not None:
+            self._merge_task.cancel()
+            self._merge_task = None
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "entries": len(self._category_keys) + len(self._keys) + len(self._delta),
+            "delta_entries": len(self._delta),
+            "items": len(self._items),
+            "truncated": self.truncated,
+            "approx_bytes": self.bytes,
+            "max_bytes": SUGGEST_MAX_BYTES,
+            "built_at": self.built_at,
+            "build_seconds": self.build_seconds,
+        }
+
+
+suggest_index = SuggestIndex()
@@ -1,11 +1,21 @@
 from fastapi import UploadFile, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from slugify import slugify
+from decouple import config
 from pathlib import Path
 from uuid import uuid4
+import hashlib
+import base64
+import binascii
+import json
+
+from app.account.log_config import logger
 
 UPLOAD_DIR = Path("uploads")
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".pdf"}
 ALLOWED_TYPES = {"image/jpeg", "image/png", "application/pdf"}
+UPLOAD_MAX_BYTES = config("UPLOAD_MAX_BYTES", default=5 * 1024 * 1024, cast=int)
+UPLOAD_CHUNK_SIZE = config("UPLOAD_CHUNK_SIZE", default=64 * 1024, cast=int)
 
 # check if the directory exist or not
 UPLOAD_DIR.mkdir(exist_ok=True)
@@ -26,49 +36,71 @@ async def save_upload_file(upload_file: UploadFile, sub_dir: str)->str:
     # Fake extensionvirus.exe.png 😬
     if upload_file.content_type not in ALLOWED_TYPES:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid content type.")
-    # create a filename
-    filename = f"{uuid4().hex}{ext}"
+
+    # Size pehle se pata ho toh bina padhe reject
+    if upload_file.size is not None and upload_file.size > UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail="File too large.")
+
     # create directory path 
     dir_path = UPLOAD_DIR / sub_dir
     # check if the directory exist or not
     dir_path.mkdir(parents=True, exist_ok=True) 
-    # create file path
-    file_path = dir_path / filename
 
-    """
-    User file upload karta hai
-    FastAPI usay UploadFile object bana deta hai
-    Tum read() se uska binary data nikalte ho
-    Disk par nayi file banate ho
-    Us data ko us file mein write kar dete ho
+    # Chunk by chunk temp file mein likho (thread pool mein), saath saath sha256 -- memory sirf aik chunk jitni
+    temp_path = dir_path / f".{uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        f = await run_in_threadpool(temp_path.open, "wb")
+        try:
+            while chunk := await upload_file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > UPLOAD_MAX_BYTES:
+                    raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail="File too large.")
+                digest.update(chunk)
+                await run_in_threadpool(f.write, chunk)
+        finally:
+            await run_in_threadpool(f.close)
+
+        # Content-addressed: same image dobara aaye toh aik hi file rehti hai
+        file_path = dir_path / f"{digest.hexdigest()}{ext}"
+        if file_path.exists():
+            await run_in_threadpool(temp_path.unlink)
+        else:
+            await run_in_threadpool(temp_path.replace, file_path)
+    except OSError:
+        logger.exception("File system error while saving upload")
+        temp_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Could not save file.")
+    except HTTPException:
+        temp_path.unlink(missing_ok=True)
+        raise
 
-    Bonus tip (large files ke liye)
+    return str(file_path)
 
-    Agar file bohat bari ho, read() poori file memory mein la deta hai (danger 😬).
-    Better approach hoti hai:
-    
-    with file_path.open("wb") as f:
-    while chunk := await upload_file.read(1024):  <------------------  tip
-        f.write(chunk)
 
-    """
+def generate_slug(text: str) -> str:
+    if not text:
+        return ""
+    return slugify(text)
 
-   
 
-    # “bhai jo file user ne bheji hai uska poora data memory mein la do”
-    try: 
-        content = await upload_file.read()
-        with file_path.open("wb") as f: 
-            f.write(content)
-    except OSError as e:
-        print(f"File system error: {e}")
-    except Exception as e: 
-        print(f"Something went wrong: {e}")
+# KEYSET CURSOR
+# Cursor sirf last row ki sort key hai (e.g. [id]), base64 mein wrap ki hui taake client ke liye opaque rahe.
+def encode_cursor(values: list) -> str:
+    # datetime sort keys (sort=newest) ISO string ban jate hain
+    raw = json.dumps(values, separators=(",", ":"), default=lambda value: value.isoformat()).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
 
-    return str(file_path)
 
+def decode_cursor(cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
 
-def generate_slug(text: str) -> str:
-    if not text:
-        return ""
-    return slugify(text)
\ No newline at end of file
+    if not isinstance(values, list) or not values:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+    return values
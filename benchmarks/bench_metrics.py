@@ -0,0 +1,96 @@
+"""
+Overhead of MetricsMiddleware and the SQL cursor listeners (app/metrics.py).
+
+    python -m benchmarks.bench_metrics
+"""
+import asyncio
+import os
+import time
+
+# Sirf benchmark ke liye defaults, .env ho toh wahi use hoga
+for key, value in {
+    "DATABASE_URL": "sqlite+aiosqlite://", "DB_ECHO": "false",
+    "JWT_ACCESS_TOKEN_TIME_MIN": "30", "JWT_ACCESS_TOKEN_TIME_DAY": "7",
+    "EMAIL_VERIFICATION_TOKEN_TIME_HOUR": "1", "PASSWORD_RESET_TOKEN": "1",
+    "JWT_SECRET_KEY": "bench-secret", "JWT_ALGORITHM": "HS256",
+}.items():
+    os.environ.setdefault(key, value)
+
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+
+from app.metrics import MetricsMiddleware, discard_query_timer, record_query, start_query_timer
+
+REQUESTS = 20000
+QUERIES = 20000
+
+
+def make_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def drive(app, requests: int = REQUESTS) -> float:
+    # Seedha ASGI call -- HTTP client ka overhead numbers mein na aaye
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+             "path": "/items/1", "raw_path": b"/items/1", "root_path": "", "query_string": b"", "headers": [],
+             "client": ("127.0.0.1", 1), "server": ("bench", 80)}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(500):
+        await app(dict(scope), receive, send)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def query_us(engine, queries: int = QUERIES) -> float:
+    with engine.connect() as connection:
+        statement = text("SELECT 1")
+        for _ in range(500):
+            connection.execute(statement)
+        start = time.perf_counter()
+        for _ in range(queries):
+            connection.execute(statement)
+        return (time.perf_counter() - start) / queries * 1e6
+
+
+def set_listeners(enabled: bool):
+    for name, func in (("before_cursor_execute", start_query_timer), ("after_cursor_execute", record_query), ("handle_error", discard_query_timer)):
+        if enabled and not event.contains(Engine, name, func):
+            event.listen(Engine, name, func)
+        elif not enabled and event.contains(Engine, name, func):
+            event.remove(Engine, name, func)
+
+
+def main():
+    plain_us = asyncio.run(drive(make_app(False)))
+    instrumented_us = asyncio.run(drive(make_app(True)))
+
+    engine = create_engine("sqlite://")
+    set_listeners(False)
+    bare_query_us = query_us(engine)
+    set_listeners(True)
+    listened_query_us = query_us(engine)
+    engine.dispose()
+
+    print(f"request   plain {plain_us:8.2f} us   instrumented {instrumented_us:8.2f} us   overhead {instrumented_us - plain_us:6.2f} us/request")
+    print(f"query     bare  {bare_query_us:8.2f} us   listeners    {listened_query_us:8.2f} us   overhead {listened_query_us - bare_query_us:6.2f} us/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Product list payload: ORM path (selectinload + from_attributes + response_model re-validation)
+vs the Core fast path in app/product/services.py (rows -> dicts -> validate once -> JSON bytes).
+100-item page, CPU per item and peak traced memory per page.
+
+    python -m benchmarks.bench_product_payload
+"""
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "bench_product_payload.db")
+
+# Sirf benchmark ke liye defaults, .env ho toh wahi use hoga
+for key, value in {
+    "DATABASE_URL": f"sqlite+aiosqlite:///{DB_PATH}", "DB_ECHO": "false",
+    "JWT_ACCESS_TOKEN_TIME_MIN": "30", "JWT_ACCESS_TOKEN_TIME_DAY": "7",
+    "EMAIL_VERIFICATION_TOKEN_TIME_HOUR": "1", "PASSWORD_RESET_TOKEN": "1",
+    "JWT_SECRET_KEY": "bench-secret", "JWT_ALGORITHM": "HS256",
+}.items():
+    os.environ.setdefault(key, value)
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.db.config import async_session, engine
+from app.product.models import Product
+from app.product.schemas import PaginatedProductOut
+from app.product.services import PRODUCT_OUT_COLUMNS, paginate_products
+from benchmarks.synthetic import create_schema, seed_catalog
+
+PAGE_SIZE = 100
+ITERATIONS = 200
+
+
+async def orm_page() -> bytes:
+    async with async_session() as session:
+        stmt = select(Product).options(selectinload(Product.categories)).order_by(Product.id).limit(PAGE_SIZE)
+        products = (await session.scalars(stmt)).all()
+        page = PaginatedProductOut.model_validate({"limit": PAGE_SIZE, "items": products, "count_strategy": "none"}, from_attributes=True)
+        # FastAPI response_model: returned model dump hota hai aur dobara validate
+        page = PaginatedProductOut.model_validate(page.model_dump())
+        return page.model_dump_json().encode()
+
+
+async def core_page() -> bytes:
+    async with async_session() as session:
+        page_data = await paginate_products(session, select(*PRODUCT_OUT_COLUMNS), PAGE_SIZE, count="none")
+        return PaginatedProductOut.model_validate(page_data).model_dump_json().encode()
+
+
+async def measure(build) -> dict:
+    for _ in range(10):
+        await build()
+
+    cpu_start = time.process_time()
+    for _ in range(ITERATIONS):
+        await build()
+    cpu_per_item_us = (time.process_time() - cpu_start) / ITERATIONS / PAGE_SIZE * 1e6
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    await build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"cpu_per_item_us": cpu_per_item_us, "peak_kib": peak / 1024}
+
+
+async def main():
+    await create_schema(engine)
+    await seed_catalog(engine, products=2000, categories=20, users=1)
+
+    orm = await measure(orm_page)
+    core = await measure(core_page)
+    await engine.dispose()
+
+    for name, result in (("orm", orm), ("core", core)):
+        print(f"{name:5} cpu {result['cpu_per_item_us']:8.2f} us/item   peak {result['peak_kib']:8.1f} KiB/page")
+    print(f"cpu saving {100 * (1 - core['cpu_per_item_us'] / orm['cpu_per_item_us']):.0f}%   "
+          f"peak memory saving {100 * (1 - core['peak_kib'] / orm['peak_kib']):.0f}%")
+
+
+if __name__ == "__main__":
+    import logging
+    logging.getLogger("account").setLevel(logging.WARNING)
+    asyncio.run(main())
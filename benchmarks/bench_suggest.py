@@ -0,0 +1,107 @@
+"""
+Autocomplete prefix index (app/product/suggest.py): build time, memory (reported vs traced),
+lookup latency (cold = memo khali, warm = memo hit) for 1-4 character prefixes, aur bulk import jaisi incremental
+adds (1000 titles per batch) ka event loop par kharcha, on synthetic titles -- DB nahi chahiye.
+
+    python -m benchmarks.bench_suggest --titles 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+import tracemalloc
+
+# Sirf benchmark ke liye defaults, .env ho toh wahi use hoga
+for key, value in {
+    "DATABASE_URL": "sqlite+aiosqlite://", "DB_ECHO": "false",
+    "JWT_ACCESS_TOKEN_TIME_MIN": "30", "JWT_ACCESS_TOKEN_TIME_DAY": "7",
+    "EMAIL_VERIFICATION_TOKEN_TIME_HOUR": "1", "PASSWORD_RESET_TOKEN": "1",
+    "JWT_SECRET_KEY": "bench-secret", "JWT_ALGORITHM": "HS256",
+    # 1M titles default 256 MiB cap se bare hain -- cap lage toh incremental adds truncation par hi ruk jate, kuch naapte nahi
+    "SUGGEST_MAX_BYTES": str(1024 * 1024 * 1024),
+}.items():
+    os.environ.setdefault(key, value)
+
+from app.product.suggest import SuggestIndex, build_arrays
+from benchmarks.synthetic import WORDS, product_title
+
+LOOKUPS = 20000
+ADD_BATCHES = 50
+ADD_BATCH_SIZE = 1000
+
+
+async def bulk_adds(index: SuggestIndex, rng: random.Random, first_id: int) -> tuple[list[float], int]:
+    # Har batch ka add_products loop par kitni der chala; delta merges threadpool mein (beech mein loop ko chhorte hain)
+    latencies = []
+    merges = 0
+    for batch in range(ADD_BATCHES):
+        products = [(first_id + batch * ADD_BATCH_SIZE + offset, product_title(rng), f"new-{batch}-{offset}") for offset in range(ADD_BATCH_SIZE)]
+        started = time.perf_counter()
+        index.add_products(products)
+        latencies.append((time.perf_counter() - started) * 1e3)
+        if index._merge_task is not None:
+            merges += 1
+        await asyncio.sleep(0)
+    while index._merge_task is not None:
+        await asyncio.sleep(0.01)
+    return sorted(latencies), merges
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--titles", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    items = [("category", index, f"category {WORDS[index % len(WORDS)]} {index}", None) for index in range(1, 51)]
+    items += [("product", index, product_title(rng), f"product-{index}") for index in range(1, args.titles + 1)]
+
+    started = time.perf_counter()
+    keys, refs, size, indexed = build_arrays(items)
+    build_seconds = time.perf_counter() - started
+
+    # Memory alag build mein -- tracemalloc build ko kai guna slow kar deta hai
+    del keys, refs
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    keys, refs, size, indexed = build_arrays(items)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    index = SuggestIndex()
+    index._keys, index._refs, index._items, index.bytes = keys, refs, items[:indexed], size
+
+    prefixes = [word[:length] for word in WORDS for length in (1, 2, 3, 4)] + ["smart ph", "wireless head"]
+    results = {}
+    for mode in ("cold", "warm"):
+        latencies = []
+        for _ in range(LOOKUPS):
+            prefix = rng.choice(prefixes)
+            if mode == "cold":
+                index._memo.clear()
+            started = time.perf_counter()
+            index.suggest(prefix, 8)
+            latencies.append((time.perf_counter() - started) * 1e6)
+        results[mode] = sorted(latencies)
+
+    assert indexed == len(items), f"index capped at {indexed} of {len(items)} items -- raise SUGGEST_MAX_BYTES"
+    add_latencies, merges = asyncio.run(bulk_adds(index, rng, args.titles + 1))
+    assert not index.truncated and len(index._items) == len(items) + ADD_BATCHES * ADD_BATCH_SIZE, "incremental adds were truncated"
+    last = index._items[-1]
+    assert any(item["id"] == last[1] for item in index.suggest(last[2], 8)), "last added title not found"
+
+    print(f"titles {args.titles}  keys {len(keys)}  indexed items {indexed}  build {build_seconds:.1f}s")
+    # Titles (items) benchmark ne banaye hain -- traced sirf index ka hissa hai, reported items bhi ginta hai
+    print(f"reported {size / 2**20:.1f} MiB (keys + items)   traced index structures {(after - before) / 2**20:.1f} MiB")
+    for mode, latencies in results.items():
+        print(f"{mode} lookup p50 {latencies[len(latencies) // 2]:.1f} us   p99 {latencies[int(len(latencies) * 0.99)]:.1f} us   "
+              f"mean {statistics.fmean(latencies):.1f} us")
+    print(f"add_products x{ADD_BATCH_SIZE}  p50 {add_latencies[len(add_latencies) // 2]:.1f} ms   max {add_latencies[-1]:.1f} ms   "
+          f"delta merges {merges}   entries {index.stats()['entries']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Synthetic catalog for benchmarks: N products, M categories (Zipf sizes), users with refresh tokens.
+
+Deterministic for a given seed, so runs before/after a change see the same data.
+App modules are imported lazily -- caller pehle DATABASE_URL / JWT env set karta hai.
+"""
+from datetime import datetime, timedelta, timezone
+import random
+import secrets
+
+from sqlalchemy import insert, text
+
+WORDS = [
+    "wireless", "bluetooth", "smart", "pro", "ultra", "mini", "max", "classic", "portable", "gaming",
+    "phone", "laptop", "tablet", "watch", "camera", "speaker", "headphones", "keyboard", "mouse", "monitor",
+    "charger", "cable", "case", "stand", "lamp", "chair", "desk", "bottle", "backpack", "jacket",
+    "cotton", "leather", "steel", "wooden", "organic", "premium", "compact", "digital", "analog", "travel",
+]
+
+BENCH_PASSWORD = "BenchPass123!"
+INSERT_BATCH = 1000
+
+
+def zipf_weights(count: int, exponent: float) -> list[float]:
+    # Category rank k ka weight 1/k^s -- chand bari categories, lambi patli tail
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def product_title(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 4))).title()
+
+
+def sqlite_compatible(metadata):
+    # SQLite "ON UPDATE" nahi samajhta -- sirf benchmark schema ke liye plain CURRENT_TIMESTAMP
+    for table in metadata.tables.values():
+        for column in table.columns:
+            default = column.server_default
+            if default is not None and "ON UPDATE" in str(getattr(default, "arg", "")):
+                default.arg = text("CURRENT_TIMESTAMP")
+
+
+async def create_schema(engine, reset: bool = True):
+    from app.db.base import Base
+    from app.db import models  # noqa: F401 -- saare models metadata mein register
+
+    if engine.dialect.name == "sqlite":
+        sqlite_compatible(Base.metadata)
+
+    async with engine.begin() as connection:
+        if reset:
+            await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+
+async def seed_catalog(engine, products: int, categories: int, users: int, zipf_exponent: float = 1.1,
+                       tokens_per_user: int = 1, seed: int = 42) -> dict:
+    """Returns jo driver ko chahiye: slugs, category names, search words, user emails aur raw refresh tokens."""
+    from app.account.auth import hash_password, hash_refresh_token
+    from app.account.models import RefreshToken, User
+    from app.product.models import Category, Product, product_category_table
+
+    rng = random.Random(seed)
+    category_names = [f"category-{index:04d}" for index in range(1, categories + 1)]
+    weights = zipf_weights(categories, zipf_exponent)
+    slugs = []
+    # created_at phaila hua (sort=newest ke liye), purane products pehle
+    created_start = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0) - timedelta(minutes=products)
+
+    async with engine.begin() as connection:
+        await connection.execute(insert(Category), [{"name": name} for name in category_names])
+
+        product_id = 0
+        for start in range(0, products, INSERT_BATCH):
+            rows, links = [], []
+            for index in range(start, min(start + INSERT_BATCH, products)):
+                product_id += 1
+                title = product_title(rng)
+                slug = f"{title.lower().replace(' ', '-')}-{index}"
+                slugs.append(slug)
+                rows.append({
+                    "id": product_id,
+                    "title": title,
+                    "description": f"{title} -- {' '.join(rng.choice(WORDS) for _ in range(12))}",
+                    "slug": slug,
+                    "price": round(rng.uniform(1, 2000), 2),
+                    "stock_quantity": rng.randint(0, 500),
+                    "image_url": "",
+                    "created_at": created_start + timedelta(minutes=index),
+                })
+                # Har product aik Zipf category mein, kuch dusri mein bhi
+                chosen = set(rng.choices(range(1, categories + 1), weights=weights, k=2 if rng.random() < 0.2 else 1))
+                links.extend({"product_id": product_id, "category_id": category_id} for category_id in chosen)
+
+            await connection.execute(insert(Product), rows)
+            await connection.execute(insert(product_category_table), links)
+
+        # bcrypt aik dafa -- sab users ka same password, seed fast rehta hai
+        password_hash = hash_password(BENCH_PASSWORD)
+        emails = [f"bench-user-{index}@example.com" for index in range(1, users + 1)]
+        await connection.execute(insert(User), [
+            {"id": index, "email": email, "hashing_password": password_hash, "is_active": True, "is_verified": True}
+            for index, email in enumerate(emails, start=1)
+        ])
+
+        refresh_tokens = []
+        expires_at = datetime.now(timezone.utc) + timedelta(days=7)
+        token_rows = []
+        for user_id in range(1, users + 1):
+            for _ in range(tokens_per_user):
+                token = secrets.token_urlsafe(32)
+                token_rows.append({"user_id": user_id, "token_hash": hash_refresh_token(token), "expires_at": expires_at})
+                refresh_tokens.append(token)
+        for start in range(0, len(token_rows), INSERT_BATCH):
+            await connection.execute(insert(RefreshToken), token_rows[start:start + INSERT_BATCH])
+
+    return {
+        "slugs": slugs,
+        "categories": category_names,
+        "words": WORDS,
+        "emails": emails,
+        "password": BENCH_PASSWORD,
+        "refresh_tokens": refresh_tokens,
+    }
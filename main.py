@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+import asyncio
 from fastapi import FastAPI
 from scalar_fastapi import get_scalar_api_reference
 
@@ -5,9 +7,30 @@ from scalar_fastapi import get_scalar_api_reference
 from app.account.routers import router as account_router
 from app.product.routers.category import router as category_router
 from app.product.routers.product import router as product_router
+from app.product.routers.media import router as media_router
+from app.product.routers.inventory import router as inventory_router
+from app.db.routers import router as db_router
+from app.db.routing import StickyPrimaryMiddleware
+from app.metrics import MetricsMiddleware
+from app.product.suggest import suggest_index
+from app.product.inventory import expiry_loop
 
 
-app = FastAPI(title="Fastapi E-Commerce Backend")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Autocomplete index startup par DB se (fail ho toh khali index, refresh loop dobara try karta hai)
+    await suggest_index.start()
+    # Abandoned stock reservations ka stock wapas
+    expiry_task = asyncio.create_task(expiry_loop())
+    yield
+    expiry_task.cancel()
+    await suggest_index.stop()
+
+
+app = FastAPI(title="Fastapi E-Commerce Backend", lifespan=lifespan)
+app.add_middleware(StickyPrimaryMiddleware)
+# Sab se bahar wala middleware -- poori request time karta hai
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/")
@@ -17,6 +40,9 @@ async def root():
 app.include_router(account_router)
 app.include_router(category_router)
 app.include_router(product_router)
+app.include_router(media_router)
+app.include_router(inventory_router)
+app.include_router(db_router)
 
 
 # BACKEND TESTING